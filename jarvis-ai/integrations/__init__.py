@@ -5,9 +5,9 @@ API integrations for popular services and platforms.
 """
 
 from .api_client import APIClient
-from .webhooks import WebhookManager
-from .smart_home import SmartHomeHub
-from .notifications import NotificationManager
+from .webhooks import WebhookManager, get_webhook_manager
+from .smart_home import SmartHomeHub, get_smart_home_hub
+from .notifications import NotificationManager, get_notification_manager
 from .calendar import CalendarManager
 from .wakey import WakeyClient, get_wakey_client
 from .notion import NotionClient, get_notion_client
@@ -16,8 +16,11 @@ from .slack import SlackClient, get_slack_client
 __all__ = [
     "APIClient",
     "WebhookManager",
+    "get_webhook_manager",
     "SmartHomeHub",
+    "get_smart_home_hub",
     "NotificationManager",
+    "get_notification_manager",
     "CalendarManager",
     "WakeyClient",
     "get_wakey_client",
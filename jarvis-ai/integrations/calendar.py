@@ -5,6 +5,7 @@ Provides calendar access and event scheduling.
 """
 
 import os
+import re
 import json
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -274,6 +275,45 @@ class CalendarManager:
 from tools.registry import tool, ToolResult
 
 
+def _today_at(value: str) -> datetime:
+    """Parse "HH:MM" as a time today."""
+    parsed = datetime.strptime(value, "%H:%M")
+    return datetime.combine(datetime.now().date(), parsed.time())
+
+
+# Start-time formats accepted by add_event, probed by regex so that only a
+# matching format is ever parsed (no exception-driven format guessing).
+_TIME_PATTERNS = [
+    (
+        re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$"),
+        datetime.fromisoformat,
+    ),
+    (
+        re.compile(r"^\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}$"),
+        lambda s: datetime.strptime(s, "%Y-%m-%d %H:%M"),
+    ),
+    (
+        re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"),
+        lambda s: datetime.strptime(s, "%Y-%m-%d"),
+    ),
+    (re.compile(r"^\d{1,2}:\d{1,2}$"), _today_at),
+]
+
+
+def _parse_start_time(value: str) -> Optional[datetime]:
+    """
+    Parse a user-supplied start time.
+    
+    Returns None if no known format matches. Raises ValueError if a
+    format matches but the value is out of range (e.g. month 13).
+    """
+    value = value.strip()
+    for pattern, parse in _TIME_PATTERNS:
+        if pattern.match(value):
+            return parse(value)
+    return None
+
+
 @tool(
     name="add_event",
     description="Add a calendar event",
@@ -290,22 +330,12 @@ def add_event(
     try:
         calendar = CalendarManager()
         
-        # Parse start time (simplified)
         try:
-            start = datetime.fromisoformat(start_time)
-        except:
-            # Try common formats
-            for fmt in ["%Y-%m-%d %H:%M", "%Y-%m-%d", "%H:%M"]:
-                try:
-                    start = datetime.strptime(start_time, fmt)
-                    if fmt == "%H:%M":
-                        today = datetime.now().date()
-                        start = datetime.combine(today, start.time())
-                    break
-                except:
-                    continue
-            else:
-                return ToolResult(success=False, error=f"Invalid time: {start_time}")
+            start = _parse_start_time(start_time)
+        except ValueError:
+            start = None
+        if start is None:
+            return ToolResult(success=False, error=f"Invalid time: {start_time}")
         
         end = start + timedelta(minutes=duration_minutes)
         event = calendar.add_event(title, start, end, description)
@@ -5,12 +5,34 @@ Sends desktop and mobile notifications.
 """
 
 import os
+import io
+import sys
+import gzip
 import json
+import zlib
+import uuid
+import queue
+import logging
+import threading
+import itertools
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any, Deque, Union
+from dataclasses import dataclass, field
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 try:
     from plyer import notification as plyer_notification
     PLYER_AVAILABLE = True
@@ -24,18 +46,124 @@ try:
 except ImportError:
     WIN32_AVAILABLE = False
 
+_message_box = None
+if os.name == 'nt':
+    try:
+        from ctypes import windll
+        _message_box = windll.user32.MessageBoxW
+    except Exception:
+        pass
+
+# MessageBox icon per priority (information, warning, error)
+_PRIORITY_ICONS = {
+    "low": 0x40,
+    "normal": 0x40,
+    "high": 0x30,
+    "urgent": 0x10,
+}
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode to JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
-@dataclass
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _legacy_items(data: bytes) -> Optional[List[Dict[str, Any]]]:
+    """Notifications from a pre-log notifications.json, or None if it isn't one."""
+    if data.lstrip()[:1] not in (b"[", b"{"):
+        return None
+    try:
+        doc = _loads(data)
+    except ValueError:
+        return None  # JSON lines, not a single document
+    if isinstance(doc, dict):
+        doc = doc.get("notifications")  # a one-line log is a dict too
+    return doc if isinstance(doc, list) else None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, init=False)
 class Notification:
-    """A notification."""
+    """
+    A notification.
+    
+    The timestamp may be given as a datetime, epoch seconds or an ISO
+    string; non-datetime values are converted on first access so that
+    loading a long history does not parse timestamps nobody reads.
+    """
     id: str
     title: str
     message: str
     category: str
     priority: str  # low, normal, high, urgent
-    timestamp: datetime
-    read: bool = False
-    actions: List[Dict] = None
+    _timestamp_raw: Union[datetime, float, str]
+    read: bool
+    actions: List[Dict]
+    _timestamp: Optional[datetime] = field(repr=False, compare=False)
+    
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        message: str,
+        category: str,
+        priority: str,
+        timestamp: Union[datetime, float, str],
+        read: bool = False,
+        actions: List[Dict] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.message = message
+        # Categories and priorities come from a small fixed vocabulary;
+        # interning shares one string object per value across the history.
+        self.category = sys.intern(category)
+        self.priority = sys.intern(priority)
+        self._timestamp_raw = timestamp
+        self._timestamp = timestamp if isinstance(timestamp, datetime) else None
+        self.read = read
+        self.actions = actions
+    
+    @property
+    def timestamp(self) -> datetime:
+        """When the notification was sent."""
+        if self._timestamp is None:
+            raw = self._timestamp_raw
+            if isinstance(raw, str):  # entries written before epoch storage
+                self._timestamp = datetime.fromisoformat(raw)
+            else:
+                self._timestamp = datetime.fromtimestamp(raw)
+        return self._timestamp
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-safe dict (timestamp as epoch seconds)."""
+        raw = self._timestamp_raw
+        if not isinstance(raw, float):
+            raw = self.timestamp.timestamp()
+        
+        return {
+            "id": self.id,
+            "title": self.title,
+            "message": self.message,
+            "category": self.category,
+            "priority": self.priority,
+            "timestamp": raw,
+            "read": self.read,
+            "actions": self.actions,
+        }
 
 
 class NotificationManager:
@@ -52,52 +180,214 @@ class NotificationManager:
     
     def __init__(
         self,
-        storage_path: str = "./storage/notifications.json",
+        storage_path: str = "./storage/notifications.jsonl.gz",
         push_webhook_url: Optional[str] = None,
+        max_history: int = 100,
     ):
         """
         Initialize notification manager.
         
         Args:
-            storage_path: Path for notification history
+            storage_path: Path for the gzipped history snapshot; changes
+                since the last compaction are appended as plain JSON lines to
+                a journal next to it (the same name without .gz)
             push_webhook_url: Webhook for mobile push
+            max_history: Number of notifications to keep
         """
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.storage_path.suffix == ".gz":
+            self.journal_path = self.storage_path.with_suffix("")
+        else:
+            self.journal_path = self.storage_path.with_name(self.storage_path.name + ".journal")
         
         self.push_webhook = push_webhook_url
-        self.notifications: List[Notification] = []
-        self.max_history = 100
+        self.max_history = max_history
+        self.notifications: Deque[Notification] = deque(maxlen=max_history)
+        self._index: Dict[str, Notification] = {}
+        # category -> bitset of positions in self.notifications
+        self._category_bits: Dict[str, int] = defaultdict(int)
+        self._unread: Dict[str, Notification] = {}  # insertion-ordered set
+        self._log_lines = 0
+        
+        # Background push delivery
+        self._push_queue: "queue.Queue[Notification]" = queue.Queue()
+        self._push_thread: Optional[threading.Thread] = None
+        self._push_client = None  # keep-alive client, owned by the worker
         
         self._load()
     
     def _load(self):
-        """Load notification history."""
-        if self.storage_path.exists():
+        """Load notification history: the snapshot, then the journal."""
+        rewrite = False
+        
+        if not self.storage_path.exists() and not self.journal_path.exists():
+            # First run since history moved out of notifications.json; the
+            # old file is migrated but left in place
+            legacy_path = self.storage_path.with_name("notifications.json")
+            if legacy_path != self.storage_path and legacy_path.exists():
+                rewrite = self._load_file(legacy_path, set_aside=False)
+        
+        for path in (self.storage_path, self.journal_path):
+            if path.exists():
+                rewrite = self._load_file(path) or rewrite
+        
+        # Legacy and plain-text snapshots are rewritten in the current
+        # format; a damaged tail would otherwise sit in front of appends
+        if rewrite:
             try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                
-                for item in data.get("notifications", []):
-                    item['timestamp'] = datetime.fromisoformat(item['timestamp'])
-                    self.notifications.append(Notification(**item))
-            except Exception:
-                pass
+                self._compact()
+            except OSError as e:
+                logger.error("Failed to rewrite notification log %s: %s", self.storage_path, e)
     
-    def _save(self):
-        """Save notification history."""
-        data = {
-            "notifications": [
-                {
-                    **asdict(n),
-                    "timestamp": n.timestamp.isoformat(),
-                }
-                for n in self.notifications[-self.max_history:]
-            ],
-        }
+    def _load_file(self, path: Path, set_aside: bool = True) -> bool:
+        """
+        Replay one history file, returning True if it should be rewritten.
         
-        with open(self.storage_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        A file whose first entry can't be read is never compacted over:
+        it is renamed to *.unreadable (unless set_aside is False) and
+        skipped.
+        """
+        try:
+            with open(path, 'rb') as f:
+                if f.read(2) == _GZIP_MAGIC:
+                    f.seek(0)
+                    return self._replay(gzip.GzipFile(fileobj=f), path)
+                f.seek(0)
+                data = f.read()
+            
+            items = _legacy_items(data)
+            if items is None:
+                return self._replay(io.BytesIO(data), path) or path == self.storage_path
+            
+            for item in items:
+                self._apply({"op": "add", "n": item})
+            logger.info("Migrated %d notifications from %s", len(items), path)
+            return True
+        except Exception as e:
+            logger.error("Notification log %s is unreadable: %s", path, e)
+            if set_aside:
+                try:
+                    path.replace(path.with_name(path.name + ".unreadable"))
+                except OSError:
+                    pass
+            return False
+    
+    def _replay(self, stream, path: Path) -> bool:
+        """
+        Apply every entry in a log stream; True if it stopped early.
+        
+        Raises if not even the first entry could be read.
+        """
+        replayed = 0
+        try:
+            for line in iter(stream.readline, b""):
+                if not line.strip():
+                    continue
+                self._log_lines += 1
+                self._apply(_loads(line))
+                replayed += 1
+        except (EOFError, OSError, zlib.error, ValueError) as e:
+            if not replayed:
+                raise
+            # A crash mid-write leaves a truncated last entry; keep
+            # everything replayed before it
+            logger.warning(
+                "Notification log %s is damaged, keeping %d entries: %s",
+                path, len(self.notifications), e,
+            )
+            return True
+        return False
+    
+    def _apply(self, entry: Dict[str, Any]):
+        """Apply a single log entry to the in-memory history."""
+        op = entry.get("op")
+        
+        if op == "add":
+            # A crash between compaction's replace and the journal unlink
+            # replays adds the snapshot already has
+            if entry["n"]["id"] not in self._index:
+                self._add(Notification(**entry["n"]))
+        elif op == "read":
+            notif = self._index.get(entry["id"])
+            if notif:
+                self._set_read(notif)
+        elif op == "read_all":
+            self._set_all_read()
+        elif op == "del":
+            notif = self._index.get(entry["id"])
+            if notif:
+                self._remove(notif)
+        elif op == "clear":
+            self._clear()
+    
+    def _add(self, notif: Notification):
+        """Add a notification to the history and indices."""
+        if len(self.notifications) == self.notifications.maxlen:
+            self._remove(self.notifications[0])  # evict oldest
+        self._category_bits[notif.category] |= 1 << len(self.notifications)
+        self.notifications.append(notif)
+        self._index[notif.id] = notif
+        if not notif.read:
+            self._unread[notif.id] = notif
+    
+    def _remove(self, notif: Notification):
+        """Remove a notification from the history and indices."""
+        pos = self.notifications.index(notif)
+        del self.notifications[pos]
+        del self._index[notif.id]
+        self._unread.pop(notif.id, None)
+        
+        # Drop bit `pos` from every bitset, shifting later positions down
+        below = (1 << pos) - 1
+        for category, bits in list(self._category_bits.items()):
+            bits = (bits & below) | ((bits >> (pos + 1)) << pos)
+            if bits:
+                self._category_bits[category] = bits
+            else:
+                del self._category_bits[category]
+    
+    def _set_read(self, notif: Notification):
+        """Mark one notification read and drop it from the unread index."""
+        notif.read = True
+        self._unread.pop(notif.id, None)
+    
+    def _set_all_read(self):
+        """Mark every unread notification read."""
+        for notif in self._unread.values():
+            notif.read = True
+        self._unread.clear()
+    
+    def _clear(self):
+        """Drop the whole history and its indices."""
+        self.notifications.clear()
+        self._index.clear()
+        self._category_bits.clear()
+        self._unread.clear()
+    
+    def _append(self, entry: Dict[str, Any]):
+        """Append one entry to the journal, compacting when it grows too long."""
+        # Plain text: a single line compresses too poorly to pay for its own
+        # gzip header and trailer, so only snapshots are compressed
+        with open(self.journal_path, 'ab') as f:
+            f.write(_dumps(entry) + b"\n")
+        self._log_lines += 1
+        
+        if self._log_lines > 2 * self.max_history:
+            self._compact()
+    
+    def _compact(self):
+        """Write the current history as the snapshot and drop the journal."""
+        tmp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+        with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+            f.write(b"".join(
+                _dumps({"op": "add", "n": notif.to_dict()}) + b"\n"
+                for notif in self.notifications
+            ))
+        os.replace(tmp_path, self.storage_path)
+        self.journal_path.unlink(missing_ok=True)
+        
+        self._log_lines = len(self.notifications)
     
     def send(
         self,
@@ -125,7 +415,7 @@ class NotificationManager:
             Notification object
         """
         notif = Notification(
-            id=f"notif_{datetime.now().timestamp()}",
+            id=f"notif_{uuid.uuid4().hex}",
             title=title,
             message=message,
             category=category,
@@ -134,8 +424,8 @@ class NotificationManager:
             actions=actions,
         )
         
-        self.notifications.append(notif)
-        self._save()
+        self._add(notif)
+        self._append({"op": "add", "n": notif.to_dict()})
         
         if desktop:
             self._show_desktop(notif)
@@ -160,38 +450,63 @@ class NotificationManager:
             except Exception:
                 pass
         
-        # Windows fallback using toast
-        if os.name == 'nt':
+        # Windows fallback using a message box
+        if _message_box is not None:
             try:
-                from ctypes import windll
-                windll.user32.MessageBoxW(
+                _message_box(
                     0,
                     notif.message,
                     f"JARVIS - {notif.title}",
-                    0x40 if notif.priority == "normal" else 0x30,
+                    _PRIORITY_ICONS.get(notif.priority, 0x30),
                 )
             except Exception:
                 pass
     
     def _send_push(self, notif: Notification):
-        """Send push notification via webhook."""
+        """Queue a push notification for the background worker."""
         if not self.push_webhook:
             return
         
+        if self._push_thread is None or not self._push_thread.is_alive():
+            self._push_thread = threading.Thread(target=self._push_worker, daemon=True)
+            self._push_thread.start()
+        
+        self._push_queue.put(notif)
+    
+    def _push_worker(self):
+        """Deliver queued push notifications off the caller's thread."""
+        while True:
+            notif = self._push_queue.get()
+            try:
+                self._do_push(notif)
+            finally:
+                self._push_queue.task_done()
+    
+    def _do_push(self, notif: Notification):
+        """Send push notification via webhook."""
+        data = _dumps({
+            "title": notif.title,
+            "message": notif.message,
+            "priority": notif.priority,
+            "category": notif.category,
+        })
+        headers = {"Content-Type": "application/json"}
+        
         try:
-            import urllib.request
+            if HTTPX_AVAILABLE:
+                # Reuse one connection across pushes instead of a new
+                # TCP/TLS handshake per notification
+                if self._push_client is None:
+                    self._push_client = httpx.Client(timeout=5.0)
+                self._push_client.post(self.push_webhook, content=data, headers=headers)
+                return
             
-            data = json.dumps({
-                "title": notif.title,
-                "message": notif.message,
-                "priority": notif.priority,
-                "category": notif.category,
-            }).encode()
+            import urllib.request
             
             request = urllib.request.Request(
                 self.push_webhook,
                 data=data,
-                headers={"Content-Type": "application/json"},
+                headers=headers,
                 method="POST",
             )
             
@@ -201,44 +516,59 @@ class NotificationManager:
     
     def get_unread(self) -> List[Notification]:
         """Get unread notifications."""
-        return [n for n in self.notifications if not n.read]
+        return list(self._unread.values())
     
     def get_recent(self, limit: int = 20) -> List[Notification]:
         """Get recent notifications."""
-        return self.notifications[-limit:]
+        start = max(0, len(self.notifications) - limit)
+        return list(itertools.islice(self.notifications, start, None))
     
     def get_by_category(self, category: str) -> List[Notification]:
         """Get notifications by category."""
-        return [n for n in self.notifications if n.category == category]
+        return self.get_by_categories([category])
+    
+    def get_by_categories(self, categories: List[str]) -> List[Notification]:
+        """Get notifications in any of the given categories, oldest first."""
+        mask = 0
+        for category in categories:
+            mask |= self._category_bits.get(category, 0)
+        
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.notifications[low.bit_length() - 1])
+            mask ^= low
+        return result
     
     def mark_read(self, notif_id: str) -> bool:
         """Mark notification as read."""
-        for notif in self.notifications:
-            if notif.id == notif_id:
-                notif.read = True
-                self._save()
-                return True
+        notif = self._index.get(notif_id)
+        if notif:
+            self._set_read(notif)
+            self._append({"op": "read", "id": notif_id})
+            return True
         return False
     
     def mark_all_read(self):
         """Mark all notifications as read."""
-        for notif in self.notifications:
-            notif.read = True
-        self._save()
+        if not self._unread:
+            return
+        self._set_all_read()
+        self._append({"op": "read_all"})
     
     def delete(self, notif_id: str) -> bool:
         """Delete a notification."""
-        for i, notif in enumerate(self.notifications):
-            if notif.id == notif_id:
-                del self.notifications[i]
-                self._save()
-                return True
+        notif = self._index.get(notif_id)
+        if notif:
+            self._remove(notif)
+            self._append({"op": "del", "id": notif_id})
+            return True
         return False
     
     def clear_all(self):
         """Clear all notifications."""
-        self.notifications.clear()
-        self._save()
+        self._clear()
+        self._compact()
     
     # Convenience methods
     def info(self, title: str, message: str):
@@ -262,6 +592,18 @@ class NotificationManager:
         return self.send(title, message, category="reminder", priority="high")
 
 
+# Singleton
+_notification_manager: Optional[NotificationManager] = None
+
+
+def get_notification_manager() -> NotificationManager:
+    """Get or create notification manager singleton."""
+    global _notification_manager
+    if _notification_manager is None:
+        _notification_manager = NotificationManager()
+    return _notification_manager
+
+
 from tools.registry import tool, ToolResult
 
 
@@ -278,7 +620,7 @@ def send_notification(
 ) -> ToolResult:
     """Send notification."""
     try:
-        manager = NotificationManager()
+        manager = get_notification_manager()
         notif = manager.send(title, message, priority=priority)
         
         return ToolResult(
@@ -297,7 +639,7 @@ def send_notification(
 def get_notifications(unread_only: bool = False) -> ToolResult:
     """Get notifications."""
     try:
-        manager = NotificationManager()
+        manager = get_notification_manager()
         
         if unread_only:
             notifs = manager.get_unread()
@@ -329,7 +671,7 @@ def get_notifications(unread_only: bool = False) -> ToolResult:
 def clear_notifications() -> ToolResult:
     """Clear notifications."""
     try:
-        manager = NotificationManager()
+        manager = get_notification_manager()
         manager.clear_all()
         
         return ToolResult(success=True, output="Notifications cleared")
@@ -340,7 +682,7 @@ def clear_notifications() -> ToolResult:
 if __name__ == "__main__":
     print("Testing Notification Manager...")
     
-    manager = NotificationManager(storage_path="./test_notifications.json")
+    manager = NotificationManager(storage_path="./test_notifications.jsonl.gz")
     
     # Send notifications
     manager.info("Test", "This is a test notification")
@@ -356,7 +698,8 @@ if __name__ == "__main__":
         print(f"  {status} [{notif.category}] {notif.title}")
     
     # Cleanup
-    if os.path.exists("./test_notifications.json"):
-        os.remove("./test_notifications.json")
+    for path in (manager.storage_path, manager.journal_path):
+        if path.exists():
+            path.unlink()
     
     print("\nNotification test complete!")
@@ -8,7 +8,10 @@ Connects to Notion API for:
 """
 
 import os
-from typing import Optional, List, Dict, Any
+import json
+import asyncio
+import itertools
+from typing import Optional, List, Dict, Any, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -18,8 +21,43 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode to JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _parse_time(value: Optional[str]) -> datetime:
+    """Parse a Notion ISO timestamp ("...Z"), defaulting to now."""
+    if not value:
+        return datetime.now()
+    if value[-1] == "Z":
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
 
-@dataclass
+
+@dataclass(slots=True)
 class NotionPage:
     """A Notion page."""
     id: str
@@ -31,7 +69,7 @@ class NotionPage:
     properties: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class NotionBlock:
     """A block in a Notion page."""
     id: str
@@ -51,6 +89,12 @@ class NotionClient:
     """
     
     BASE_URL = "https://api.notion.com/v1"
+    MAX_PAGE_SIZE = 100  # Notion API limit per request
+    
+    # Keep connections warm between tool calls
+    MAX_CONNECTIONS = 16
+    MAX_KEEPALIVE = 8
+    KEEPALIVE_EXPIRY = 30.0
     
     def __init__(self, token: str = None):
         """
@@ -61,21 +105,32 @@ class NotionClient:
         """
         self.token = token or os.environ.get("NOTION_TOKEN")
         self._client = None
+        self._title_keys: Dict[str, str] = {}  # database_id -> title property
         
         if not HTTPX_AVAILABLE:
             print("Warning: httpx not installed. Run: pip install httpx")
     
+    def _headers(self) -> Dict[str, str]:
+        """Request headers for the Notion API."""
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Notion-Version": "2022-06-28",
+            "Content-Type": "application/json",
+        }
+    
     def _get_client(self):
-        """Get or create HTTP client."""
+        """Get or create HTTP client (HTTP/2 when h2 is installed)."""
         if not self._client:
             self._client = httpx.Client(
                 base_url=self.BASE_URL,
-                headers={
-                    "Authorization": f"Bearer {self.token}",
-                    "Notion-Version": "2022-06-28",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0,
+                headers=self._headers(),
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(30.0, connect=5.0),
             )
         return self._client
     
@@ -83,6 +138,50 @@ class NotionClient:
         """Check if Notion is properly configured."""
         return bool(self.token) and HTTPX_AVAILABLE
     
+    def _paginate(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> Iterator[NotionPage]:
+        """
+        Yield pages from a paginated POST endpoint, following next_cursor.
+        
+        Further requests are only made as the caller keeps consuming.
+        """
+        payload = {**payload, "page_size": min(page_size, self.MAX_PAGE_SIZE)}
+        
+        while True:
+            response = self._get_client().post(path, content=_dumps(payload))
+            response.raise_for_status()
+            data = _loads(response.content)
+            
+            for result in data.get("results", []):
+                yield self._parse_page(result)
+            
+            cursor = data.get("next_cursor")
+            if not data.get("has_more") or not cursor:
+                break
+            payload["start_cursor"] = cursor
+    
+    def iter_search(
+        self,
+        query: str,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> Iterator[NotionPage]:
+        """Lazily iterate over all pages matching a search query."""
+        if not self.is_configured():
+            return iter(())
+        
+        return self._paginate(
+            "/search",
+            {
+                "query": query,
+                "filter": {"property": "object", "value": "page"},
+            },
+            page_size,
+        )
+    
     def search_pages(self, query: str, limit: int = 10) -> List[NotionPage]:
         """
         Search for pages in workspace.
@@ -94,26 +193,8 @@ class NotionClient:
         Returns:
             List of matching NotionPage objects
         """
-        if not self.is_configured():
-            return []
-        
         try:
-            response = self._get_client().post(
-                "/search",
-                json={
-                    "query": query,
-                    "filter": {"property": "object", "value": "page"},
-                    "page_size": limit,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            pages = []
-            for result in data.get("results", []):
-                pages.append(self._parse_page(result))
-            return pages
-            
+            return list(itertools.islice(self.iter_search(query, page_size=limit), limit))
         except Exception as e:
             print(f"Notion search error: {e}")
             return []
@@ -126,7 +207,48 @@ class NotionClient:
         try:
             response = self._get_client().get(f"/pages/{page_id}")
             response.raise_for_status()
-            return self._parse_page(response.json())
+            return self._parse_page(_loads(response.content))
+        except Exception as e:
+            print(f"Error getting page: {e}")
+            return None
+    
+    def get_pages(self, page_ids: List[str]) -> List[Optional[NotionPage]]:
+        """
+        Get several pages concurrently.
+        
+        Args:
+            page_ids: Page IDs to fetch
+            
+        Returns:
+            Pages in the same order as page_ids (None for failed fetches)
+        """
+        if not self.is_configured() or not page_ids:
+            return []
+        
+        return asyncio.run(self._gather_pages(page_ids))
+    
+    async def _gather_pages(self, page_ids: List[str]) -> List[Optional[NotionPage]]:
+        """Fetch pages over one async client."""
+        async with httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            headers=self._headers(),
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        ) as client:
+            return await asyncio.gather(
+                *(self._aget_page(client, page_id) for page_id in page_ids)
+            )
+    
+    async def _aget_page(self, client, page_id: str) -> Optional[NotionPage]:
+        """Get a page by ID using an async client."""
+        try:
+            response = await client.get(f"/pages/{page_id}")
+            response.raise_for_status()
+            return self._parse_page(_loads(response.content))
         except Exception as e:
             print(f"Error getting page: {e}")
             return None
@@ -175,9 +297,9 @@ class NotionClient:
             ]
         
         try:
-            response = self._get_client().post("/pages", json=payload)
+            response = self._get_client().post("/pages", content=_dumps(payload))
             response.raise_for_status()
-            return self._parse_page(response.json())
+            return self._parse_page(_loads(response.content))
         except Exception as e:
             print(f"Error creating page: {e}")
             return None
@@ -202,7 +324,7 @@ class NotionClient:
         try:
             response = self._get_client().patch(
                 f"/blocks/{page_id}/children",
-                json=payload,
+                content=_dumps(payload),
             )
             response.raise_for_status()
             return True
@@ -210,60 +332,73 @@ class NotionClient:
             print(f"Error appending to page: {e}")
             return False
     
-    def query_database(
+    def iter_database(
         self,
         database_id: str,
         filter_obj: Dict = None,
-        limit: int = 10,
-    ) -> List[NotionPage]:
-        """Query a Notion database."""
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> Iterator[NotionPage]:
+        """Lazily iterate over all rows of a Notion database query."""
         if not self.is_configured():
-            return []
+            return iter(())
         
-        payload = {"page_size": limit}
+        payload = {}
         if filter_obj:
             payload["filter"] = filter_obj
         
+        return self._paginate(f"/databases/{database_id}/query", payload, page_size)
+    
+    def query_database(
+        self,
+        database_id: str,
+        filter_obj: Dict = None,
+        limit: int = 10,
+    ) -> List[NotionPage]:
+        """Query a Notion database."""
         try:
-            response = self._get_client().post(
-                f"/databases/{database_id}/query",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return [self._parse_page(r) for r in data.get("results", [])]
+            return list(itertools.islice(
+                self.iter_database(database_id, filter_obj, page_size=limit),
+                limit,
+            ))
         except Exception as e:
             print(f"Error querying database: {e}")
             return []
     
     def _parse_page(self, data: Dict) -> NotionPage:
         """Parse API response to NotionPage."""
-        # Extract title from properties
-        title = "Untitled"
         props = data.get("properties", {})
-        
-        for key, value in props.items():
-            if value.get("type") == "title":
-                title_arr = value.get("title", [])
-                if title_arr:
-                    title = title_arr[0].get("plain_text", "Untitled")
-                break
-        
         parent = data.get("parent", {})
         parent_type = parent.get("type", "unknown")
         
+        # Database rows share a schema, so remember which property holds
+        # the title and look it up directly on later rows.
+        database_id = parent.get("database_id")
+        title_prop = None
+        if database_id in self._title_keys:
+            title_prop = props.get(self._title_keys[database_id])
+        
+        if title_prop is None or title_prop.get("type") != "title":
+            title_prop = None
+            for key, value in props.items():
+                if value.get("type") == "title":
+                    title_prop = value
+                    if database_id:
+                        self._title_keys[database_id] = key
+                    break
+        
+        title = "Untitled"
+        if title_prop:
+            title_arr = title_prop.get("title")
+            if title_arr:
+                title = title_arr[0].get("plain_text", "Untitled")
+        
         return NotionPage(
             id=data.get("id", ""),
             title=title,
             url=data.get("url", ""),
             parent_type=parent_type,
-            created_time=datetime.fromisoformat(
-                data.get("created_time", datetime.now().isoformat()).replace("Z", "+00:00")
-            ),
-            last_edited=datetime.fromisoformat(
-                data.get("last_edited_time", datetime.now().isoformat()).replace("Z", "+00:00")
-            ),
+            created_time=_parse_time(data.get("created_time")),
+            last_edited=_parse_time(data.get("last_edited_time")),
             properties=props,
         )
     
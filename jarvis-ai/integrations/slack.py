@@ -8,8 +8,14 @@ Connects to Slack Web API for:
 """
 
 import os
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+import json
+import logging
+import time
+import atexit
+import asyncio
+import threading
+from typing import Optional, List, Dict, Any, Coroutine, Set, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
 try:
@@ -18,8 +24,42 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 
-@dataclass
+def _dumps(obj: Any) -> bytes:
+    """Encode to JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class SlackChannel:
     """A Slack channel."""
     id: str
@@ -29,19 +69,44 @@ class SlackChannel:
     topic: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SlackMessage:
     """A Slack message."""
     ts: str  # Timestamp ID
     user: str
     text: str
     channel: str
-    timestamp: datetime
+    _timestamp: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Message time, parsed from ts on first access."""
+        if self._timestamp is None:
+            try:
+                self._timestamp = datetime.fromtimestamp(float(self.ts))
+            except ValueError:
+                self._timestamp = datetime.now()
+        return self._timestamp
+
+
+class _ResponseReader:
+    """Async file-like view of a streamed httpx response, for ijson."""
+    
+    def __init__(self, response: "httpx.Response"):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes with read(0) to detect bytes vs str
+            return b""
+        return await anext(self._chunks, b"")
 
 
 class SlackClient:
     """
-    Client for Slack Web API.
+    Async client for Slack Web API.
+    
+    API methods are coroutines so callers can issue several Slack calls
+    concurrently; use run_sync() to call them from synchronous code.
     
     Features:
     - Send messages
@@ -51,6 +116,12 @@ class SlackClient:
     """
     
     BASE_URL = "https://slack.com/api"
+    CHANNEL_TTL = 180.0  # seconds to reuse a channel listing
+    
+    # Connection pool shared by all calls for the life of the process
+    MAX_CONNECTIONS = 50
+    MAX_KEEPALIVE = 20
+    KEEPALIVE_EXPIRY = 60.0
     
     def __init__(self, token: str = None):
         """
@@ -62,27 +133,45 @@ class SlackClient:
         self.token = token or os.environ.get("SLACK_TOKEN")
         self._client = None
         
+        # (fetched_at, limit, channels) and name -> channel for the listing
+        self._channels_cache: Optional[Tuple[float, int, List[SlackChannel]]] = None
+        self._channels_by_name: Dict[str, SlackChannel] = {}
+        # Channel listings left running to warm the cache; the loop only
+        # keeps weak references to tasks
+        self._prefetches: Set[asyncio.Task] = set()
+        
         if not HTTPX_AVAILABLE:
-            print("Warning: httpx not installed. Run: pip install httpx")
+            logger.warning("httpx not installed. Run: pip install httpx")
     
     def _get_client(self):
         """Get or create HTTP client."""
         if not self._client:
-            self._client = httpx.Client(
+            transport = httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._client = httpx.AsyncClient(
                 base_url=self.BASE_URL,
                 headers={
                     "Authorization": f"Bearer {self.token}",
                     "Content-Type": "application/json",
                 },
                 timeout=30.0,
+                transport=transport,
             )
+            atexit.register(self.close)
         return self._client
     
     def is_configured(self) -> bool:
         """Check if Slack is properly configured."""
         return bool(self.token) and HTTPX_AVAILABLE
     
-    def get_channels(self, limit: int = 20) -> List[SlackChannel]:
+    async def get_channels(self, limit: int = 20) -> List[SlackChannel]:
         """
         Get list of channels the bot can access.
         
@@ -95,15 +184,20 @@ class SlackClient:
         if not self.is_configured():
             return []
         
+        if self._channels_cache:
+            fetched_at, cached_limit, cached = self._channels_cache
+            if time.monotonic() - fetched_at < self.CHANNEL_TTL and cached_limit >= limit:
+                return cached[:limit]
+        
         try:
-            response = self._get_client().get(
+            response = await self._get_client().get(
                 "/conversations.list",
                 params={"limit": limit, "types": "public_channel,private_channel"},
             )
-            data = response.json()
+            data = _loads(response.content)
             
             if not data.get("ok"):
-                print(f"Slack error: {data.get('error')}")
+                logger.warning("Slack error: %s", data.get("error"))
                 return []
             
             channels = []
@@ -115,13 +209,16 @@ class SlackClient:
                     is_member=ch.get("is_member", False),
                     topic=ch.get("topic", {}).get("value", ""),
                 ))
+            
+            self._channels_cache = (time.monotonic(), limit, channels)
+            self._channels_by_name = {ch.name.lower(): ch for ch in channels}
             return channels
             
         except Exception as e:
-            print(f"Error getting channels: {e}")
+            logger.warning("Error getting channels: %s", e)
             return []
     
-    def send_message(
+    async def send_message(
         self,
         channel: str,
         text: str,
@@ -146,11 +243,13 @@ class SlackClient:
             payload["thread_ts"] = thread_ts
         
         try:
-            response = self._get_client().post("/chat.postMessage", json=payload)
-            data = response.json()
+            response = await self._get_client().post("/chat.postMessage", content=_dumps(payload))
+            data = _loads(response.content)
             
             if not data.get("ok"):
-                print(f"Slack error: {data.get('error')}")
+                if data.get("error") == "channel_not_found":
+                    self.invalidate_channels()
+                logger.warning("Slack error: %s", data.get("error"))
                 return None
             
             return SlackMessage(
@@ -158,14 +257,13 @@ class SlackClient:
                 user="bot",
                 text=text,
                 channel=channel,
-                timestamp=datetime.now(),
             )
             
         except Exception as e:
-            print(f"Error sending message: {e}")
+            logger.warning("Error sending message: %s", e)
             return None
     
-    def get_messages(
+    async def get_messages(
         self,
         channel: str,
         limit: int = 10,
@@ -183,53 +281,157 @@ class SlackClient:
         if not self.is_configured():
             return []
         
+        return await self._history(channel, limit) or []
+    
+    async def read_channel(
+        self,
+        channel: str,
+        limit: int = 10,
+    ) -> Optional[List[SlackMessage]]:
+        """
+        Get recent messages from a channel given by ID or name.
+        
+        On a cold cache the channel listing and a history request using
+        the argument as an ID are sent concurrently, so a valid ID costs
+        one round trip and a name no more than two.
+        
+        Returns:
+            List of SlackMessage objects, or None if the channel is unknown
+        """
+        if not self.is_configured():
+            return None
+        
+        name = channel.lower().lstrip("#")
+        if self._channels_cache and time.monotonic() - self._channels_cache[0] < self.CHANNEL_TTL:
+            ch = self._channels_by_name.get(name)
+            return await self._history(ch.id if ch else channel, limit)
+        
+        # Local, not an attribute: overlapping calls share this client
+        listing = asyncio.create_task(self.find_channel(name))
+        history_task = asyncio.create_task(self._history(channel, limit))
+        
+        messages = await history_task
+        if messages is not None:
+            # Leave the listing running so it still warms the cache
+            self._prefetches.add(listing)
+            listing.add_done_callback(self._prefetches.discard)
+            return messages
+        
+        ch = await listing
+        if ch is None:
+            return None
+        return await self._history(ch.id, limit)
+    
+    async def _history(self, channel: str, limit: int) -> Optional[List[SlackMessage]]:
+        """Fetch conversations.history, returning None on API errors."""
         try:
-            response = self._get_client().get(
+            async with self._get_client().stream(
+                "GET",
                 "/conversations.history",
                 params={"channel": channel, "limit": limit},
-            )
-            data = response.json()
+            ) as response:
+                if IJSON_AVAILABLE:
+                    data, messages = await self._parse_history_stream(response, channel)
+                else:
+                    data = _loads(await response.aread())
+                    messages = [
+                        self._to_message(msg, channel)
+                        for msg in data.get("messages", [])
+                    ]
             
             if not data.get("ok"):
-                print(f"Slack error: {data.get('error')}")
-                return []
+                if data.get("error") != "channel_not_found":
+                    logger.warning("Slack error: %s", data.get("error"))
+                return None
             
-            messages = []
-            for msg in data.get("messages", []):
-                try:
-                    ts = float(msg.get("ts", 0))
-                    timestamp = datetime.fromtimestamp(ts)
-                except:
-                    timestamp = datetime.now()
-                
-                messages.append(SlackMessage(
-                    ts=msg.get("ts", ""),
-                    user=msg.get("user", "unknown"),
-                    text=msg.get("text", ""),
-                    channel=channel,
-                    timestamp=timestamp,
-                ))
             return messages
             
         except Exception as e:
-            print(f"Error getting messages: {e}")
-            return []
+            logger.warning("Error getting messages: %s", e)
+            return None
     
-    def find_channel(self, name: str) -> Optional[SlackChannel]:
-        """Find a channel by name."""
-        channels = self.get_channels(limit=100)
-        name_lower = name.lower().lstrip("#")
+    async def _parse_history_stream(
+        self,
+        response: "httpx.Response",
+        channel: str,
+    ) -> Tuple[Dict[str, Any], List[SlackMessage]]:
+        """
+        Parse a conversations.history body while it downloads.
         
-        for ch in channels:
-            if ch.name.lower() == name_lower:
-                return ch
-        return None
+        Messages are built one at a time as they arrive; of the envelope
+        only "ok" and "error" are kept.
+        """
+        envelope: Dict[str, Any] = {}
+        messages: List[SlackMessage] = []
+        builder = None
+        
+        async for prefix, event, value in ijson.parse_async(_ResponseReader(response)):
+            if builder is not None:
+                if prefix == "messages.item" and event == "end_map":
+                    messages.append(self._to_message(builder.value, channel))
+                    builder = None
+                else:
+                    builder.event(event, value)
+            elif prefix == "messages.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in ("ok", "error"):
+                envelope[prefix] = value
+        
+        return envelope, messages
     
-    def close(self):
+    @staticmethod
+    def _to_message(msg: Dict[str, Any], channel: str) -> SlackMessage:
+        """Build a SlackMessage from an API message object."""
+        return SlackMessage(
+            ts=msg.get("ts", ""),
+            user=msg.get("user", "unknown"),
+            text=msg.get("text", ""),
+            channel=channel,
+        )
+    
+    async def find_channel(self, name: str) -> Optional[SlackChannel]:
+        """Find a channel by name."""
+        await self.get_channels(limit=100)
+        return self._channels_by_name.get(name.lower().lstrip("#"))
+    
+    def invalidate_channels(self):
+        """Drop the cached channel listing."""
+        self._channels_cache = None
+        self._channels_by_name = {}
+    
+    async def aclose(self):
         """Close the client."""
         if self._client:
-            self._client.close()
+            await self._client.aclose()
             self._client = None
+    
+    def close(self):
+        """Close the client from synchronous code."""
+        if self._client:
+            run_sync(self.aclose())
+
+
+# Background event loop shared by all synchronous callers. The async
+# client's pooled connections belong to one loop, so it must outlive
+# individual calls (a fresh asyncio.run() per call would strand them).
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """Run a SlackClient coroutine from synchronous code."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
 
 
 # Singleton
@@ -266,13 +468,13 @@ def slack_send(channel: str, message: str) -> ToolResult:
     
     # Find channel if name provided
     if not channel.startswith("C"):
-        ch = client.find_channel(channel)
+        ch = run_sync(client.find_channel(channel))
         if ch:
             channel = ch.id
         else:
             return ToolResult(success=False, error=f"Channel '{channel}' not found")
     
-    result = client.send_message(channel, message)
+    result = run_sync(client.send_message(channel, message))
     
     if result:
         return ToolResult(success=True, output=f"Message sent to {channel}")
@@ -295,7 +497,7 @@ def slack_channels() -> ToolResult:
             error="Slack not configured. Set SLACK_TOKEN environment variable.",
         )
     
-    channels = client.get_channels()
+    channels = run_sync(client.get_channels())
     
     if not channels:
         return ToolResult(success=True, output="No channels found")
@@ -324,15 +526,10 @@ def slack_read(channel: str, count: int = 5) -> ToolResult:
             error="Slack not configured. Set SLACK_TOKEN environment variable.",
         )
     
-    # Find channel if name provided
-    if not channel.startswith("C"):
-        ch = client.find_channel(channel)
-        if ch:
-            channel = ch.id
-        else:
-            return ToolResult(success=False, error=f"Channel '{channel}' not found")
+    messages = run_sync(client.read_channel(channel, count))
     
-    messages = client.get_messages(channel, count)
+    if messages is None:
+        return ToolResult(success=False, error=f"Channel '{channel}' not found")
     
     if not messages:
         return ToolResult(success=True, output="No messages found")
@@ -353,7 +550,7 @@ if __name__ == "__main__":
     
     if client.is_configured():
         print("Slack configured!")
-        channels = client.get_channels(limit=5)
+        channels = run_sync(client.get_channels(limit=5))
         print(f"Found {len(channels)} channels")
         for ch in channels:
             print(f"  - #{ch.name}")
@@ -6,13 +6,63 @@ Provides integration with smart home platforms (Home Assistant, etc.)
 
 import os
 import json
+import logging
+import uuid
+import asyncio
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any, Coroutine, Set, Tuple
+from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
-@dataclass
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode to indented JSON bytes; devices are serialized as dicts."""
+    if ORJSON_AVAILABLE:
+        # orjson serializes dataclasses natively, without copying
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=lambda o: o.to_dict()).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Home Assistant entity domains imported as devices
+_HA_PREFIXES = ("light.", "switch.", "climate.")
+_NO_ATTRIBUTES: Dict[str, Any] = {}
+
+
+@dataclass(slots=True)
 class SmartDevice:
     """A smart home device."""
     id: str
@@ -21,9 +71,20 @@ class SmartDevice:
     state: Dict[str, Any]
     room: Optional[str] = None
     platform: str = "generic"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict form (asdict would deep-copy the state dict)."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "state": self.state,
+            "room": self.room,
+            "platform": self.platform,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceState:
     """Device state snapshot."""
     device_id: str
@@ -43,6 +104,10 @@ class SmartHomeHub:
     - Home Assistant integration (optional)
     """
     
+    HA_RETRY_DELAY = 1.0  # seconds before the first listener reconnect
+    HA_RETRY_MAX_DELAY = 300.0  # cap for the doubling reconnect delay
+    HA_AUTH_TIMEOUT = 10.0  # seconds to wait for each auth handshake message
+    
     def __init__(
         self,
         config_path: str = "./storage/smart_home.json",
@@ -64,37 +129,101 @@ class SmartHomeHub:
         self.ha_token = home_assistant_token
         
         self.devices: Dict[str, SmartDevice] = {}
+        self._name_index: Dict[str, str] = {}  # lowercased name -> device id
         self.rooms: Dict[str, List[str]] = {}
         self.scenes: Dict[str, Dict] = {}
+        self._dirty = False
+        self._mtime_ns: Optional[int] = None  # config mtime as of last load/save
+        self._ha_listener: Optional[threading.Thread] = None
+        # Guards state changes and saves; the HA listener thread writes too
+        self._lock = threading.RLock()
         
         self._load()
     
-    def _load(self):
-        """Load device configuration."""
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, 'r') as f:
-                    data = json.load(f)
-                
-                for device_data in data.get("devices", []):
-                    device = SmartDevice(**device_data)
-                    self.devices[device.id] = device
-                
-                self.rooms = data.get("rooms", {})
-                self.scenes = data.get("scenes", {})
-            except Exception:
-                pass
+    def _load(self) -> bool:
+        """Load device configuration; False if the file couldn't be read."""
+        # Recorded even if the load fails, so a bad file is handled once
+        # rather than on every reload_if_changed()
+        self._mtime_ns = self._config_mtime()
+        if self._mtime_ns is None:
+            return True
+        
+        try:
+            with open(self.config_path, 'rb') as f:
+                data = _loads(f.read())
+            
+            devices = {}
+            for device_data in data.get("devices", []):
+                device = SmartDevice(**device_data)
+                devices[device.id] = device
+        except Exception:
+            logger.exception("Failed to load smart home config %s", self.config_path)
+            return False
+        
+        self.devices = devices
+        self.rooms = data.get("rooms", {})
+        self.scenes = data.get("scenes", {})
+        self._rebuild_name_index()
+        return True
+    
+    def _rebuild_name_index(self):
+        """Rebuild the lowercased name index (first device wins on clashes)."""
+        self._name_index = {}
+        for device in self.devices.values():
+            self._name_index.setdefault(device.name.lower(), device.id)
+    
+    def _config_mtime(self) -> Optional[int]:
+        """Modification time of the config file, or None if missing."""
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the config if another process changed it on disk.
+        
+        A config that can't be parsed leaves the current devices in place.
+        
+        Returns:
+            True if the config was reloaded
+        """
+        if self._config_mtime() == self._mtime_ns:
+            return False
+        
+        with self._lock:
+            if self._config_mtime() is None:
+                # Deleted: start over, as if the hub were new
+                self.devices = {}
+                self._name_index = {}
+                self.rooms = {}
+                self.scenes = {}
+            return self._load()
     
     def _save(self):
-        """Save configuration."""
-        data = {
-            "devices": [asdict(d) for d in self.devices.values()],
-            "rooms": self.rooms,
-            "scenes": self.scenes,
-        }
+        """Save configuration (atomically, via a temp file)."""
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
         
-        with open(self.config_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        # One writer at a time on the shared tmp path, and no state changes
+        # while the snapshot is serialized
+        with self._lock:
+            data = {
+                "devices": list(self.devices.values()),
+                "rooms": self.rooms,
+                "scenes": self.scenes,
+            }
+            
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(data))
+            os.replace(tmp_path, self.config_path)
+            self._dirty = False
+            self._mtime_ns = self._config_mtime()
+    
+    def _flush(self):
+        """Save only if state changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
     
     def add_device(
         self,
@@ -115,7 +244,7 @@ class SmartHomeHub:
         Returns:
             SmartDevice
         """
-        device_id = f"device_{len(self.devices)}_{datetime.now().timestamp()}"
+        device_id = f"device_{uuid.uuid4().hex[:12]}"
         
         device = SmartDevice(
             id=device_id,
@@ -125,28 +254,32 @@ class SmartHomeHub:
             room=room,
         )
         
-        self.devices[device_id] = device
-        
-        if room:
-            self.rooms.setdefault(room, [])
-            self.rooms[room].append(device_id)
-        
-        self._save()
+        with self._lock:
+            self.devices[device_id] = device
+            self._name_index.setdefault(name.lower(), device_id)
+            
+            if room:
+                self.rooms.setdefault(room, [])
+                self.rooms[room].append(device_id)
+            
+            self._save()
         return device
     
     def remove_device(self, device_id: str) -> bool:
         """Remove a device."""
-        if device_id in self.devices:
-            device = self.devices[device_id]
-            
-            if device.room and device.room in self.rooms:
-                self.rooms[device.room] = [
-                    d for d in self.rooms[device.room] if d != device_id
-                ]
-            
-            del self.devices[device_id]
-            self._save()
-            return True
+        with self._lock:
+            if device_id in self.devices:
+                device = self.devices[device_id]
+                
+                if device.room and device.room in self.rooms:
+                    self.rooms[device.room] = [
+                        d for d in self.rooms[device.room] if d != device_id
+                    ]
+                
+                del self.devices[device_id]
+                self._rebuild_name_index()
+                self._save()
+                return True
         return False
     
     def get_device(self, device_id: str) -> Optional[SmartDevice]:
@@ -154,12 +287,17 @@ class SmartHomeHub:
         return self.devices.get(device_id)
     
     def find_device(self, name: str) -> Optional[SmartDevice]:
-        """Find device by name."""
+        """Find device by name (exact match first, then substring)."""
         name_lower = name.lower()
-        for device in self.devices.values():
-            if name_lower in device.name.lower():
-                return device
-        return None
+        
+        device_id = self._name_index.get(name_lower)
+        if device_id is None:
+            device_id = next(
+                (did for lowered, did in self._name_index.items() if name_lower in lowered),
+                None,
+            )
+        
+        return self.devices.get(device_id) if device_id else None
     
     def list_devices(self, room: str = None, device_type: str = None) -> List[SmartDevice]:
         """List devices with optional filters."""
@@ -174,13 +312,35 @@ class SmartHomeHub:
         return devices
     
     def set_state(self, device_id: str, state: Dict) -> Optional[SmartDevice]:
-        """Set device state."""
+        """
+        Set device state.
+        
+        Home Assistant devices are updated there first; the local state
+        only changes once Home Assistant accepted the change.
+        
+        Raises:
+            RuntimeError: If Home Assistant rejected the change
+        """
+        device = self.devices.get(device_id)
+        if device is None:
+            return None
+        
+        if self._push_home_assistant([(device, state)]):
+            raise RuntimeError(f"Home Assistant did not accept the change to {device.name}")
+        
+        self._update_state(device_id, state)
+        self._flush()
+        return device
+    
+    def _update_state(self, device_id: str, state: Dict) -> Optional[SmartDevice]:
+        """Update device state in memory, deferring the save to the caller."""
         if device_id not in self.devices:
             return None
         
         device = self.devices[device_id]
-        device.state.update(state)
-        self._save()
+        with self._lock:
+            device.state.update(state)
+            self._dirty = True
         
         return device
     
@@ -213,15 +373,12 @@ class SmartHomeHub:
     # Room controls
     def control_room(self, room: str, state: Dict) -> List[SmartDevice]:
         """Control all devices in a room."""
-        controlled = []
-        
-        device_ids = self.rooms.get(room, [])
-        for device_id in device_ids:
-            device = self.set_state(device_id, state)
-            if device:
-                controlled.append(device)
-        
-        return controlled
+        changes = [
+            (self.devices[device_id], state)
+            for device_id in self.rooms.get(room, [])
+            if device_id in self.devices
+        ]
+        return self._apply_changes(changes)
     
     def room_on(self, room: str) -> List[SmartDevice]:
         """Turn on all devices in room."""
@@ -240,12 +397,13 @@ class SmartHomeHub:
             name: Scene name
             device_states: Dict of device_id -> state
         """
-        self.scenes[name] = {
-            "name": name,
-            "states": device_states,
-            "created": datetime.now().isoformat(),
-        }
-        self._save()
+        with self._lock:
+            self.scenes[name] = {
+                "name": name,
+                "states": device_states,
+                "created": datetime.now().isoformat(),
+            }
+            self._save()
         return True
     
     def activate_scene(self, name: str) -> List[SmartDevice]:
@@ -253,14 +411,24 @@ class SmartHomeHub:
         if name not in self.scenes:
             return []
         
-        scene = self.scenes[name]
-        controlled = []
+        changes = [
+            (self.devices[device_id], state)
+            for device_id, state in self.scenes[name].get("states", {}).items()
+            if device_id in self.devices
+        ]
+        return self._apply_changes(changes)
+    
+    def _apply_changes(self, changes: List[Tuple[SmartDevice, Dict]]) -> List[SmartDevice]:
+        """Apply several state changes with one save, skipping ones Home Assistant rejected."""
+        failed = self._push_home_assistant(changes)
         
-        for device_id, state in scene.get("states", {}).items():
-            device = self.set_state(device_id, state)
-            if device:
+        controlled = []
+        for device, state in changes:
+            if device.id not in failed:
+                self._update_state(device.id, state)
                 controlled.append(device)
         
+        self._flush()
         return controlled
     
     def list_scenes(self) -> List[str]:
@@ -268,6 +436,80 @@ class SmartHomeHub:
         return list(self.scenes.keys())
     
     # Home Assistant integration
+    def _ha_service_calls(
+        self,
+        device: SmartDevice,
+        state: Dict,
+    ) -> List[Tuple[str, str, Dict]]:
+        """Translate a state change into Home Assistant service calls."""
+        domain = device.type
+        target = {"entity_id": device.id}
+        calls = []
+        
+        if "target_temp" in state and domain == "climate":
+            calls.append((domain, "set_temperature", {**target, "temperature": state["target_temp"]}))
+        
+        if "brightness" in state and domain == "light" and state.get("on", True):
+            calls.append((domain, "turn_on", {**target, "brightness_pct": state["brightness"]}))
+        elif "on" in state:
+            calls.append((domain, "turn_on" if state["on"] else "turn_off", target))
+        
+        return calls
+    
+    def _push_home_assistant(self, changes: List[Tuple[SmartDevice, Dict]]) -> Set[str]:
+        """
+        Push state changes for Home Assistant devices concurrently.
+        
+        Returns:
+            Entity ids whose update failed (empty if all succeeded)
+        """
+        if not self.ha_url or not self.ha_token or not HTTPX_AVAILABLE:
+            return set()
+        
+        calls = [
+            call
+            for device, state in changes
+            if device.platform == "home_assistant"
+            for call in self._ha_service_calls(device, state)
+        ]
+        if not calls:
+            return set()
+        
+        try:
+            return run_sync(self._ha_post_all(calls))
+        except Exception as e:
+            logger.error("Home Assistant update failed: %s", e)
+            return {data["entity_id"] for _, _, data in calls}
+    
+    async def _ha_post_all(self, calls: List[Tuple[str, str, Dict]]) -> Set[str]:
+        """POST all service calls over one client, concurrently; returns failed entity ids."""
+        async with httpx.AsyncClient(
+            base_url=self.ha_url,
+            headers={
+                "Authorization": f"Bearer {self.ha_token}",
+                "Content-Type": "application/json",
+            },
+            timeout=10.0,
+        ) as client:
+            async def post(domain: str, service: str, data: Dict):
+                response = await client.post(f"/api/services/{domain}/{service}", content=_dumps(data))
+                response.raise_for_status()
+            
+            results = await asyncio.gather(
+                *(post(domain, service, data) for domain, service, data in calls),
+                return_exceptions=True,
+            )
+        
+        failed = set()
+        for (domain, service, data), result in zip(calls, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    "Home Assistant %s.%s for %s failed: %s",
+                    domain, service, data["entity_id"], result,
+                )
+                failed.add(data["entity_id"])
+        return failed
+    
     def sync_home_assistant(self) -> int:
         """
         Sync devices from Home Assistant.
@@ -289,33 +531,163 @@ class SmartHomeHub:
                 },
             )
             
-            with urllib.request.urlopen(request, timeout=10) as response:
-                states = json.loads(response.read().decode())
-            
             count = 0
-            for entity in states:
-                entity_id = entity.get("entity_id", "")
+            with urllib.request.urlopen(request, timeout=10) as response:
+                # Parse entities one at a time straight off the socket when
+                # ijson is available rather than buffering the whole body
+                if IJSON_AVAILABLE:
+                    states = ijson.items(response, "item")
+                else:
+                    states = _loads(response.read())
                 
-                # Filter for common device types
-                if any(entity_id.startswith(t) for t in ["light.", "switch.", "climate."]):
-                    device_type = entity_id.split(".")[0]
+                for entity in states:
+                    entity_id = entity.get("entity_id", "")
                     
-                    device = SmartDevice(
-                        id=entity_id,
-                        name=entity.get("attributes", {}).get("friendly_name", entity_id),
-                        type=device_type,
-                        state={"on": entity.get("state") == "on"},
-                        platform="home_assistant",
-                    )
-                    
-                    self.devices[entity_id] = device
-                    count += 1
+                    # Filter for common device types
+                    if entity_id.startswith(_HA_PREFIXES):
+                        device_type = entity_id[:entity_id.index(".")]
+                        attributes = entity.get("attributes") or _NO_ATTRIBUTES
+                        
+                        device = SmartDevice(
+                            id=entity_id,
+                            name=attributes.get("friendly_name", entity_id),
+                            type=device_type,
+                            state={"on": entity.get("state") == "on"},
+                            platform="home_assistant",
+                        )
+                        
+                        self.devices[entity_id] = device
+                        count += 1
             
+            self._rebuild_name_index()
             self._save()
             return count
         
-        except Exception:
+        except Exception as e:
+            logger.warning("Home Assistant sync failed: %s", e)
             return 0
+    
+    def start_home_assistant_listener(self) -> bool:
+        """
+        Keep Home Assistant devices in sync from state_changed events.
+        
+        Call sync_home_assistant() first to populate devices; afterwards
+        only entities that actually change are updated, instead of
+        re-fetching every state.
+        
+        The listener connects in the background. Connection and
+        authentication failures, and dropped connections, are logged and
+        retried with exponential backoff.
+        
+        Returns:
+            True if the listener thread was started (or already running);
+            this says nothing about whether it has connected yet
+        """
+        if not self.ha_url or not self.ha_token or not AIOHTTP_AVAILABLE:
+            return False
+        
+        if self._ha_listener is None or not self._ha_listener.is_alive():
+            self._ha_listener = threading.Thread(
+                target=lambda: asyncio.run(self._ha_listen()),
+                daemon=True,
+            )
+            self._ha_listener.start()
+        return True
+    
+    async def _ha_listen(self):
+        """Stay subscribed to Home Assistant state changes, reconnecting on failure."""
+        ws_url = self.ha_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        delay = self.HA_RETRY_DELAY
+        
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    # Heartbeats notice a silently dropped connection
+                    async with session.ws_connect(f"{ws_url}/api/websocket", heartbeat=30.0) as ws:
+                        await self._ha_subscribe(ws)
+                        logger.info("Listening for Home Assistant state changes")
+                        delay = self.HA_RETRY_DELAY
+                        
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            message = _loads(msg.data)
+                            if message.get("type") == "event":
+                                self._apply_ha_event(message.get("event", {}).get("data", {}))
+                
+                logger.warning("Home Assistant websocket closed, reconnecting in %.0fs", delay)
+            except Exception as e:
+                logger.warning("Home Assistant listener failed: %s; retrying in %.0fs", e, delay)
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.HA_RETRY_MAX_DELAY)
+    
+    async def _ha_subscribe(self, ws):
+        """Authenticate on a fresh websocket and subscribe to state_changed."""
+        await asyncio.wait_for(ws.receive_json(), self.HA_AUTH_TIMEOUT)  # auth_required
+        await ws.send_json({"type": "auth", "access_token": self.ha_token})
+        reply = await asyncio.wait_for(ws.receive_json(), self.HA_AUTH_TIMEOUT)
+        if reply.get("type") != "auth_ok":
+            raise ConnectionError(
+                f"Home Assistant authentication failed: {reply.get('message', reply.get('type'))}"
+            )
+        
+        await ws.send_json({
+            "id": 1,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+        })
+    
+    def _apply_ha_event(self, data: Dict):
+        """Apply one state_changed event to the matching device."""
+        device = self.devices.get(data.get("entity_id", ""))
+        new_state = data.get("new_state")
+        if device is None or device.platform != "home_assistant" or not new_state:
+            return
+        
+        is_on = new_state.get("state") == "on"
+        with self._lock:
+            if device.state.get("on") != is_on:
+                device.state["on"] = is_on
+                self._dirty = True
+                self._flush()
+
+
+# Background event loop for Home Assistant pushes, shared by all
+# synchronous callers (asyncio.run() fails inside a running loop)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """Run a SmartHomeHub coroutine from synchronous code."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+# Singleton
+_smart_home_hub: Optional[SmartHomeHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_smart_home_hub() -> SmartHomeHub:
+    """Get or create smart home hub singleton, picking up on-disk changes."""
+    global _smart_home_hub
+    with _hub_lock:
+        if _smart_home_hub is None:
+            _smart_home_hub = SmartHomeHub()
+        else:
+            _smart_home_hub.reload_if_changed()
+        return _smart_home_hub
 
 
 from tools.registry import tool, ToolResult
@@ -334,7 +706,7 @@ def smart_device(
 ) -> ToolResult:
     """Control smart device."""
     try:
-        hub = SmartHomeHub()
+        hub = get_smart_home_hub()
         device = hub.find_device(device_name)
         
         if not device:
@@ -374,7 +746,7 @@ def smart_device(
 def list_smart_devices(room: str = None) -> ToolResult:
     """List devices."""
     try:
-        hub = SmartHomeHub()
+        hub = get_smart_home_hub()
         devices = hub.list_devices(room=room)
         
         return ToolResult(
@@ -402,7 +774,10 @@ def list_smart_devices(room: str = None) -> ToolResult:
 def activate_scene(scene_name: str) -> ToolResult:
     """Activate scene."""
     try:
-        hub = SmartHomeHub()
+        hub = get_smart_home_hub()
+        if scene_name not in hub.scenes:
+            return ToolResult(success=False, error=f"Scene not found: {scene_name}")
+        
         devices = hub.activate_scene(scene_name)
         
         if devices:
@@ -410,7 +785,7 @@ def activate_scene(scene_name: str) -> ToolResult:
                 success=True,
                 output=f"Activated scene '{scene_name}' ({len(devices)} devices)",
             )
-        return ToolResult(success=False, error=f"Scene not found: {scene_name}")
+        return ToolResult(success=False, error=f"No devices in scene '{scene_name}' could be updated")
     except Exception as e:
         return ToolResult(success=False, error=str(e))
 
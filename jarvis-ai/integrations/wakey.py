@@ -9,8 +9,11 @@ Connects to Wakey Electron app's local HTTP API for:
 """
 
 import json
+import time
+import logging
 import asyncio
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Callable, Coroutine, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -20,8 +23,59 @@ try:
 except ImportError:
     AIOHTTP_AVAILABLE = False
 
+try:
+    import uvloop  # libuv-based loop; not available on Windows
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# API paths, relative to the session's base URL
+_PING_PATH = "/api/ping"
+_TASKS_PATH = "/api/tasks"
+_NOTES_PATH = "/api/notes"
+_NOTES_SEARCH_PATH = "/api/notes/search"
+_EVENTS_PATH = "/api/events"
+_REMINDERS_PATH = "/api/reminders"
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
-@dataclass
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed."""
+    if UVLOOP_AVAILABLE:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp, accepting a trailing "Z"; None if missing."""
+    if not value:
+        return None
+    if value[-1] == "Z":
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class WakeyTask:
     """Task from Wakey."""
     id: str
@@ -32,8 +86,21 @@ class WakeyTask:
     completed: bool
     tags: List[str]
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WakeyTask":
+        """Create from an API response object."""
+        return cls(
+            id=data.get("id", ""),
+            title=data.get("title", ""),
+            description=data.get("description"),
+            due_date=_parse_time(data.get("due_date")),
+            priority=data.get("priority", 1),
+            completed=data.get("completed", False),
+            tags=data.get("tags", []),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class WakeyNote:
     """Note from Wakey."""
     id: str
@@ -43,8 +110,20 @@ class WakeyNote:
     updated_at: datetime
     folder: Optional[str]
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WakeyNote":
+        """Create from an API response object."""
+        return cls(
+            id=data.get("id", ""),
+            title=data.get("title", ""),
+            content=data.get("content", ""),
+            created_at=_parse_time(data.get("created_at")) or datetime.now(),
+            updated_at=_parse_time(data.get("updated_at")) or datetime.now(),
+            folder=data.get("folder"),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class WakeyEvent:
     """Calendar event from Wakey."""
     id: str
@@ -54,6 +133,18 @@ class WakeyEvent:
     location: Optional[str]
     description: Optional[str]
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WakeyEvent":
+        """Create from an API response object."""
+        return cls(
+            id=data.get("id", ""),
+            title=data.get("title", ""),
+            start_time=_parse_time(data.get("start_time")) or datetime.now(),
+            end_time=_parse_time(data.get("end_time")) or datetime.now(),
+            location=data.get("location"),
+            description=data.get("description"),
+        )
+
 
 class WakeyClient:
     """
@@ -69,6 +160,15 @@ class WakeyClient:
     """
 
     DEFAULT_PORT = 9876  # Wakey's local API port
+    # Wakey is the only host, so the per-host limit is the pool size. It
+    # covers a full batch fanned out when Wakey has no bulk endpoint.
+    MAX_CONNECTIONS = 64
+    MAX_CONNECTIONS_PER_HOST = 64
+    KEEPALIVE_TIMEOUT = 75.0  # seconds an idle connection is kept open
+    REQUEST_TIMEOUT = 10.0
+    CACHE_TTL = 2.0  # seconds a GET result is reused without revalidating
+    BATCH_SIZE = 32  # creates sent in one bulk request
+    BATCH_DELAY = 0.02  # seconds to wait for more creates before flushing
 
     def __init__(self, port: int = None):
         """
@@ -81,6 +181,12 @@ class WakeyClient:
         self.base_url = f"http://localhost:{self.port}/api"
         self.connected = False
         self._session: Optional[aiohttp.ClientSession] = None
+        self._pending: Dict[str, List[Tuple[Dict, asyncio.Future]]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self._bulk_supported: Dict[str, bool] = {}
+        # (path, params) -> (etag, parsed items, fetched at)
+        self._etag_cache: Dict[Tuple, Tuple[Optional[str], List, float]] = {}
 
     async def connect(self) -> bool:
         """
@@ -90,31 +196,64 @@ class WakeyClient:
             True if connected successfully
         """
         if not AIOHTTP_AVAILABLE:
-            print("aiohttp not installed. Run: pip install aiohttp")
+            logger.warning("aiohttp not installed. Run: pip install aiohttp")
             return False
 
         try:
-            self._session = aiohttp.ClientSession()
-            async with self._session.get(f"{self.base_url}/ping", timeout=aiohttp.ClientTimeout(total=5)) as resp:
+            session = await self._get_session()
+            async with session.get(_PING_PATH, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
                     self.connected = True
                     return True
         except Exception as e:
-            print(f"Could not connect to Wakey: {e}")
+            logger.warning("Could not connect to Wakey: %s", e)
         return False
 
     async def disconnect(self):
         """Close connection."""
+        for path in list(self._flush_handles):
+            self._start_flush(path)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
         if self._session:
             await self._session.close()
             self._session = None
         self.connected = False
 
+    async def __aenter__(self) -> "WakeyClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the pooled session, creating it on first use or after close."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                base_url=f"http://localhost:{self.port}",
+                connector=aiohttp.TCPConnector(
+                    limit=self.MAX_CONNECTIONS,
+                    limit_per_host=self.MAX_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                    force_close=False,
+                    ttl_dns_cache=None,  # localhost never moves
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT),
+            )
+        return self._session
+
     async def _ensure_connected(self) -> bool:
-        """Ensure we have a valid connection."""
-        if not self.connected or not self._session:
-            return await self.connect()
-        return True
+        """
+        Ensure we have a valid connection.
+
+        Wakey is pinged only before the first request and again after a
+        request fails; otherwise the pooled session is reused as is.
+        """
+        if self.connected and self._session is not None and not self._session.closed:
+            return True
+        return await self.connect()
 
     # ===== Tasks API =====
 
@@ -133,12 +272,12 @@ class WakeyClient:
 
         try:
             params = {"completed": "false"} if filter_completed else {}
-            async with self._session.get(f"{self.base_url}/tasks", params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return [self._parse_task(t) for t in data.get("tasks", [])]
+            tasks = await self._get_list(_TASKS_PATH, params, "tasks", WakeyTask.from_dict)
+            if tasks is not None:
+                return tasks
         except Exception as e:
-            print(f"Error getting tasks: {e}")
+            self.connected = False
+            logger.warning("Error getting tasks: %s", e)
         return []
 
     async def create_task(
@@ -174,12 +313,12 @@ class WakeyClient:
         }
 
         try:
-            async with self._session.post(f"{self.base_url}/tasks", json=payload) as resp:
-                if resp.status == 201:
-                    data = await resp.json()
-                    return self._parse_task(data)
+            data = await self._submit(_TASKS_PATH, payload)
+            if data is not None:
+                return WakeyTask.from_dict(data)
         except Exception as e:
-            print(f"Error creating task: {e}")
+            self.connected = False
+            logger.warning("Error creating task: %s", e)
         return None
 
     async def complete_task(self, task_id: str) -> bool:
@@ -196,13 +335,15 @@ class WakeyClient:
             return False
 
         try:
+            self._invalidate(_TASKS_PATH)
             async with self._session.patch(
-                f"{self.base_url}/tasks/{task_id}",
+                f"{_TASKS_PATH}/{task_id}",
                 json={"completed": True}
             ) as resp:
                 return resp.status == 200
         except Exception as e:
-            print(f"Error completing task: {e}")
+            self.connected = False
+            logger.warning("Error completing task: %s", e)
         return False
 
     async def delete_task(self, task_id: str) -> bool:
@@ -211,9 +352,12 @@ class WakeyClient:
             return False
 
         try:
-            async with self._session.delete(f"{self.base_url}/tasks/{task_id}") as resp:
+            self._invalidate(_TASKS_PATH)
+            async with self._session.delete(f"{_TASKS_PATH}/{task_id}") as resp:
                 return resp.status == 200
-        except:
+        except Exception as e:
+            self.connected = False
+            logger.warning("Error deleting task: %s", e)
             return False
 
     # ===== Notes API =====
@@ -237,12 +381,12 @@ class WakeyClient:
             if folder:
                 params["folder"] = folder
                 
-            async with self._session.get(f"{self.base_url}/notes", params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return [self._parse_note(n) for n in data.get("notes", [])]
+            notes = await self._get_list(_NOTES_PATH, params, "notes", WakeyNote.from_dict)
+            if notes is not None:
+                return notes
         except Exception as e:
-            print(f"Error getting notes: {e}")
+            self.connected = False
+            logger.warning("Error getting notes: %s", e)
         return []
 
     async def create_note(
@@ -270,12 +414,12 @@ class WakeyClient:
             payload["folder"] = folder
 
         try:
-            async with self._session.post(f"{self.base_url}/notes", json=payload) as resp:
-                if resp.status == 201:
-                    data = await resp.json()
-                    return self._parse_note(data)
+            data = await self._submit(_NOTES_PATH, payload)
+            if data is not None:
+                return WakeyNote.from_dict(data)
         except Exception as e:
-            print(f"Error creating note: {e}")
+            self.connected = False
+            logger.warning("Error creating note: %s", e)
         return None
 
     async def search_notes(self, query: str) -> List[WakeyNote]:
@@ -292,15 +436,12 @@ class WakeyClient:
             return []
 
         try:
-            async with self._session.get(
-                f"{self.base_url}/notes/search",
-                params={"q": query}
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return [self._parse_note(n) for n in data.get("notes", [])]
+            notes = await self._get_list(_NOTES_SEARCH_PATH, {"q": query}, "notes", WakeyNote.from_dict)
+            if notes is not None:
+                return notes
         except Exception as e:
-            print(f"Error searching notes: {e}")
+            self.connected = False
+            logger.warning("Error searching notes: %s", e)
         return []
 
     # ===== Calendar API =====
@@ -330,12 +471,12 @@ class WakeyClient:
             if end:
                 params["end"] = end.isoformat()
 
-            async with self._session.get(f"{self.base_url}/events", params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return [self._parse_event(e) for e in data.get("events", [])]
+            events = await self._get_list(_EVENTS_PATH, params, "events", WakeyEvent.from_dict)
+            if events is not None:
+                return events
         except Exception as e:
-            print(f"Error getting events: {e}")
+            self.connected = False
+            logger.warning("Error getting events: %s", e)
         return []
 
     async def create_event(
@@ -373,12 +514,13 @@ class WakeyClient:
             payload["description"] = description
 
         try:
-            async with self._session.post(f"{self.base_url}/events", json=payload) as resp:
+            async with self._session.post(_EVENTS_PATH, json=payload) as resp:
                 if resp.status == 201:
-                    data = await resp.json()
-                    return self._parse_event(data)
+                    data = _loads(await resp.read())
+                    return WakeyEvent.from_dict(data)
         except Exception as e:
-            print(f"Error creating event: {e}")
+            self.connected = False
+            logger.warning("Error creating event: %s", e)
         return None
 
     # ===== Reminders API =====
@@ -394,12 +536,12 @@ class WakeyClient:
             return []
 
         try:
-            async with self._session.get(f"{self.base_url}/reminders") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("reminders", [])
+            reminders = await self._get_list(_REMINDERS_PATH, {}, "reminders", dict)
+            if reminders is not None:
+                return reminders
         except Exception as e:
-            print(f"Error getting reminders: {e}")
+            self.connected = False
+            logger.warning("Error getting reminders: %s", e)
         return []
 
     async def create_reminder(self, message: str, remind_at: datetime) -> bool:
@@ -417,50 +559,193 @@ class WakeyClient:
             return False
 
         try:
-            async with self._session.post(
-                f"{self.base_url}/reminders",
-                json={"message": message, "remind_at": remind_at.isoformat()}
-            ) as resp:
-                return resp.status == 201
+            payload = {"message": message, "remind_at": remind_at.isoformat()}
+            return await self._submit(_REMINDERS_PATH, payload) is not None
         except Exception as e:
-            print(f"Error creating reminder: {e}")
+            self.connected = False
+            logger.warning("Error creating reminder: %s", e)
         return False
 
-    # ===== Parsers =====
+    # ===== Cached reads =====
 
-    def _parse_task(self, data: Dict) -> WakeyTask:
-        """Parse task from API response."""
-        return WakeyTask(
-            id=data.get("id", ""),
-            title=data.get("title", ""),
-            description=data.get("description"),
-            due_date=datetime.fromisoformat(data["due_date"]) if data.get("due_date") else None,
-            priority=data.get("priority", 1),
-            completed=data.get("completed", False),
-            tags=data.get("tags", []),
-        )
+    async def _get_list(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        key: str,
+        parse: Callable[[Dict], Any],
+    ) -> Optional[List]:
+        """
+        GET a list resource, reusing recent results.
 
-    def _parse_note(self, data: Dict) -> WakeyNote:
-        """Parse note from API response."""
-        return WakeyNote(
-            id=data.get("id", ""),
-            title=data.get("title", ""),
-            content=data.get("content", ""),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
-            updated_at=datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat())),
-            folder=data.get("folder"),
-        )
+        Results younger than CACHE_TTL are returned without a request;
+        older ones are revalidated with If-None-Match so an unchanged
+        list costs a 304 instead of the full body.
 
-    def _parse_event(self, data: Dict) -> WakeyEvent:
-        """Parse event from API response."""
-        return WakeyEvent(
-            id=data.get("id", ""),
-            title=data.get("title", ""),
-            start_time=datetime.fromisoformat(data.get("start_time", datetime.now().isoformat())),
-            end_time=datetime.fromisoformat(data.get("end_time", datetime.now().isoformat())),
-            location=data.get("location"),
-            description=data.get("description"),
+        Returns:
+            Parsed items, or None if the request failed
+        """
+        cache_key = (path, tuple(sorted(params.items())))
+        cached = self._etag_cache.get(cache_key)
+        if cached and time.monotonic() - cached[2] < self.CACHE_TTL:
+            return list(cached[1])
+
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else None
+        async with self._session.get(
+            path, params=params, headers=headers
+        ) as resp:
+            if resp.status == 304 and cached:
+                self._etag_cache[cache_key] = (cached[0], cached[1], time.monotonic())
+                return list(cached[1])
+            if resp.status != 200:
+                return None
+            etag = resp.headers.get("ETag")
+            if IJSON_AVAILABLE:
+                # Build items while the body is still arriving
+                items = [
+                    parse(item)
+                    async for item in ijson.items_async(resp.content, f"{key}.item", use_float=True)
+                ]
+            else:
+                data = _loads(await resp.read())
+                items = [parse(item) for item in data.get(key, [])]
+
+        self._etag_cache[cache_key] = (etag, items, time.monotonic())
+        return list(items)
+
+    def _invalidate(self, path: str):
+        """Forget cached reads of a resource after it changes."""
+        for cache_key in [k for k in self._etag_cache if k[0].startswith(path)]:
+            del self._etag_cache[cache_key]
+
+    # ===== Batched creates =====
+
+    async def _submit(self, path: str, payload: Dict) -> Optional[Dict]:
+        """
+        Queue a create request and wait for its result.
+
+        Creates for the same resource made within BATCH_DELAY of each
+        other (or until BATCH_SIZE are waiting) are sent together.
+
+        Returns:
+            Created object as returned by Wakey, or None on failure
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(path, [])
+        batch.append((payload, future))
+
+        if len(batch) >= self.BATCH_SIZE:
+            self._start_flush(path)
+        elif len(batch) == 1:
+            self._flush_handles[path] = loop.call_later(
+                self.BATCH_DELAY, self._start_flush, path
+            )
+        return await future
+
+    def _start_flush(self, path: str):
+        """Send everything queued for a resource in the background."""
+        handle = self._flush_handles.pop(path, None)
+        if handle:
+            handle.cancel()
+        batch = self._pending.pop(path, None)
+        if batch:
+            task = asyncio.ensure_future(self._flush(path, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, path: str, batch: List[Tuple[Dict, asyncio.Future]]):
+        """Create a batch with one bulk request, or concurrently if unsupported."""
+        self._invalidate(path)
+        payloads = [payload for payload, _ in batch]
+        try:
+            results = None
+            if len(payloads) > 1 and self._bulk_supported.get(path, True):
+                results = await self._post_bulk(path, payloads)
+            if results is None:
+                results = await asyncio.gather(
+                    *(self._post_one(path, payload) for payload in payloads)
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _post_one(self, path: str, payload: Dict) -> Optional[Dict]:
+        """POST a single create request."""
+        async with self._session.post(path, json=payload) as resp:
+            if resp.status != 201:
+                return None
+            body = await resp.read()
+            return _loads(body) if body else {}
+
+    async def _post_bulk(self, path: str, payloads: List[Dict]) -> Optional[List[Optional[Dict]]]:
+        """
+        POST {"items": [...]} to the resource's /bulk endpoint.
+
+        Returns:
+            One result per payload, or None if the caller should fall back
+            to individual creates (no bulk endpoint, or an unusable reply)
+        """
+        async with self._session.post(
+            f"{path}/bulk", json={"items": payloads}
+        ) as resp:
+            if resp.status in (404, 405):
+                self._bulk_supported[path] = False
+                return None
+            if not 200 <= resp.status < 300:
+                logger.warning(
+                    "Bulk create on %s failed with HTTP %d, creating individually",
+                    path, resp.status,
+                )
+                return None
+            body = await resp.read()
+
+        try:
+            data = _loads(body) if body else None
+        except ValueError:
+            data = None
+        items = data.get("items") if isinstance(data, dict) else None
+        if not isinstance(items, list) or len(items) < len(payloads):
+            logger.warning(
+                "Bulk create on %s returned no per-item results, creating individually",
+                path,
+            )
+            return None
+        return items[:len(payloads)]
+
+    # ===== Dashboard =====
+
+    async def fetch_dashboard(self) -> Dict[str, List]:
+        """
+        Fetch tasks, notes, events and reminders concurrently.
+
+        The four requests share the pooled session, so the dashboard
+        takes as long as the slowest endpoint rather than all four.
+
+        Returns:
+            Dict with "tasks", "notes", "events" and "reminders" lists
+        """
+        if not await self._ensure_connected():
+            return {"tasks": [], "notes": [], "events": [], "reminders": []}
+
+        results = await asyncio.gather(
+            self.get_tasks(),
+            self.get_notes(),
+            self.get_events(),
+            self.get_reminders(),
+            return_exceptions=True,
         )
+        keys = ("tasks", "notes", "events", "reminders")
+        return {
+            key: [] if isinstance(result, BaseException) else result
+            for key, result in zip(keys, results)
+        }
 
 
 # Sync singleton
@@ -475,21 +760,26 @@ def get_wakey_client() -> WakeyClient:
     return _wakey_client
 
 
-# Synchronous wrapper for tools
-def run_async(coro):
-    """Run async code from sync context."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're already in an async context, use nest_asyncio
-            try:
-                import nest_asyncio
-                nest_asyncio.apply()
-            except ImportError:
-                pass
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+# Background event loop shared by all synchronous callers. The pooled
+# ClientSession belongs to one loop, so the loop must outlive individual
+# tool calls (asyncio.run() per call would close it every time).
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = _new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
+
+def run_async(coro: Coroutine) -> Any:
+    """Run a WakeyClient coroutine from synchronous code."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
 
 
 if __name__ == "__main__":
@@ -5,29 +5,85 @@ Receives and processes webhooks from external services.
 """
 
 import os
+import re
 import json
 import hmac
+import logging
+import asyncio
 import hashlib
+import time
+from collections import deque
+from itertools import count, islice
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Deque, Set, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
-@dataclass
+try:
+    import uvloop  # libuv-based loop; not available on Windows
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode to indented JSON bytes; configs are serialized as dicts."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=asdict).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Bodies starting like this are parsed as JSON whatever their Content-Type
+# (e.g. curl -d sends JSON as application/x-www-form-urlencoded)
+_JSON_START = re.compile(rb"\s*[\[{]")
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed."""
+    if UVLOOP_AVAILABLE:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+@dataclass(slots=True)
 class WebhookEvent:
     """A received webhook event."""
     id: str
     source: str
     event_type: str
     payload: Dict[str, Any]
-    received_at: datetime
+    received_ts: float  # epoch seconds
     signature_valid: Optional[bool] = None
+    
+    @property
+    def received_at(self) -> datetime:
+        """Receive time as a datetime, built on access."""
+        return datetime.fromtimestamp(self.received_ts)
 
 
-@dataclass
+@dataclass(slots=True)
 class WebhookConfig:
     """Webhook endpoint configuration."""
     name: str
@@ -52,6 +108,7 @@ class WebhookManager:
         storage_path: str = "./storage/webhooks",
         host: str = "localhost",
         port: int = 8765,
+        max_events: int = 100,
     ):
         """
         Initialize webhook manager.
@@ -60,6 +117,7 @@ class WebhookManager:
             storage_path: Path for webhook data
             host: Server host
             port: Server port
+            max_events: Number of recent events kept in memory
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
@@ -68,11 +126,18 @@ class WebhookManager:
         self.port = port
         
         self.endpoints: Dict[str, WebhookConfig] = {}
-        self.events: List[WebhookEvent] = []
+        self._by_path: Dict[str, WebhookConfig] = {}
+        self._hmac_templates: Dict[Tuple[str, str], "hmac.HMAC"] = {}
+        self._mtime_ns: Optional[int] = None  # config mtime as of last load/save
+        self._dirty = False  # endpoints changed since the last save
+        self.events: Deque[WebhookEvent] = deque(maxlen=max_events)
+        self._event_counter = count()
         self.handlers: Dict[str, Callable] = {}
         
-        self._server = None
-        self._server_thread = None
+        self._runner: Optional["web.AppRunner"] = None
+        self._server_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._handler_tasks: Set[asyncio.Future] = set()
         
         self._load()
     
@@ -81,27 +146,62 @@ class WebhookManager:
         config_file = self.storage_path / "webhooks.json"
         if config_file.exists():
             try:
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
+                with open(config_file, 'rb') as f:
+                    data = _loads(f.read())
                 
                 for name, config in data.get("endpoints", {}).items():
                     self.endpoints[name] = WebhookConfig(**config)
+                self._rebuild_path_index()
+                self._mtime_ns = self._config_mtime()
             except Exception:
-                pass
+                logger.exception("Failed to load webhook config %s", config_file)
+    
+    def _config_mtime(self) -> Optional[int]:
+        """Modification time of webhooks.json, or None if missing."""
+        try:
+            return os.stat(self.storage_path / "webhooks.json").st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload endpoints if another process changed them on disk.
+        
+        Returns:
+            True if the config was reloaded
+        """
+        if self._config_mtime() == self._mtime_ns:
+            return False
+        
+        self.endpoints = {}
+        self._by_path = {}
+        self._load()
+        return True
+    
+    def _rebuild_path_index(self):
+        """Map each path to its endpoint; the first registered one wins."""
+        self._by_path = {}
+        self._hmac_templates = {}  # drop keys of removed endpoints
+        for config in self.endpoints.values():
+            self._by_path.setdefault(config.path, config)
+            if config.secret:
+                self._hmac_template(config.secret, "sha256")
     
     def _save(self):
-        """Save configurations."""
+        """Save configurations (atomically, via a temp file)."""
         config_file = self.storage_path / "webhooks.json"
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
         
-        data = {
-            "endpoints": {
-                name: asdict(config)
-                for name, config in self.endpoints.items()
-            },
-        }
-        
-        with open(config_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps({"endpoints": self.endpoints}))
+        os.replace(tmp_file, config_file)
+        self._dirty = False
+        self._mtime_ns = self._config_mtime()
+    
+    def flush(self):
+        """Save only if endpoints changed since the last save."""
+        if self._dirty:
+            self._save()
     
     def register_endpoint(
         self,
@@ -109,6 +209,7 @@ class WebhookManager:
         path: str,
         secret: str = None,
         handler: str = None,
+        save: bool = True,
     ) -> WebhookConfig:
         """
         Register a webhook endpoint.
@@ -118,6 +219,8 @@ class WebhookManager:
             path: URL path (e.g., /github)
             secret: Verification secret
             handler: Tool to run on event
+            save: Save immediately; pass False when registering many
+                endpoints and call flush() once afterwards
             
         Returns:
             WebhookConfig
@@ -130,15 +233,21 @@ class WebhookManager:
         )
         
         self.endpoints[name] = config
-        self._save()
+        self._rebuild_path_index()
+        self._dirty = True
+        if save:
+            self._save()
         
         return config
     
-    def unregister_endpoint(self, name: str) -> bool:
+    def unregister_endpoint(self, name: str, save: bool = True) -> bool:
         """Remove a webhook endpoint."""
         if name in self.endpoints:
             del self.endpoints[name]
-            self._save()
+            self._rebuild_path_index()
+            self._dirty = True
+            if save:
+                self._save()
             return True
         return False
     
@@ -153,11 +262,9 @@ class WebhookManager:
         if not secret or not signature:
             return False
         
-        expected = hmac.new(
-            secret.encode(),
-            payload,
-            getattr(hashlib, algorithm),
-        ).hexdigest()
+        mac = self._hmac_template(secret, algorithm).copy()
+        mac.update(payload)
+        expected = mac.hexdigest()
         
         # Handle prefixed signatures (e.g., sha256=xxx)
         if '=' in signature:
@@ -165,10 +272,19 @@ class WebhookManager:
         
         return hmac.compare_digest(expected, signature)
     
+    def _hmac_template(self, secret: str, algorithm: str) -> "hmac.HMAC":
+        """Keyed HMAC to copy per message, so the key is only set up once."""
+        key = (secret, algorithm)
+        template = self._hmac_templates.get(key)
+        if template is None:
+            template = hmac.new(secret.encode(), digestmod=getattr(hashlib, algorithm))
+            self._hmac_templates[key] = template
+        return template
+    
     def handle_event(
         self,
         path: str,
-        payload: Dict,
+        body: bytes,
         headers: Dict,
     ) -> WebhookEvent:
         """
@@ -176,97 +292,163 @@ class WebhookManager:
         
         Args:
             path: Request path
-            payload: Event payload
+            body: Raw request body, as signed by the sender
             headers: Request headers
             
         Returns:
             WebhookEvent
         """
-        # Find matching endpoint
-        endpoint = None
-        for config in self.endpoints.values():
-            if config.path == path.lstrip('/'):
-                endpoint = config
-                break
+        payload = self._parse_body(body, headers.get("Content-Type", ""))
+        
+        endpoint = self._by_path.get(path.lstrip('/'))
         
         event = WebhookEvent(
-            id=f"evt_{datetime.now().timestamp()}",
+            id=f"evt_{time.monotonic_ns():x}_{next(self._event_counter)}",
             source=endpoint.name if endpoint else "unknown",
             event_type=headers.get("X-Event-Type", payload.get("type", "unknown")),
             payload=payload,
-            received_at=datetime.now(),
+            received_ts=time.time(),
         )
         
         # Verify signature if configured
         if endpoint and endpoint.secret:
             signature = headers.get("X-Hub-Signature-256") or headers.get("X-Signature")
             event.signature_valid = self.verify_signature(
-                json.dumps(payload).encode(),
+                body,
                 signature or "",
                 endpoint.secret,
             )
         
         # Log event
         self.events.append(event)
-        if len(self.events) > 100:
-            self.events = self.events[-100:]
         
         # Trigger handler if configured
         if endpoint and endpoint.handler and self.handlers.get(endpoint.handler):
+            self._dispatch(self.handlers[endpoint.handler], event)
+        
+        return event
+    
+    @staticmethod
+    def _parse_body(body: bytes, content_type: str) -> Dict[str, Any]:
+        """
+        Parse a webhook body as JSON, keeping anything else as raw text.
+        
+        Only bodies declared as JSON or starting like a JSON document are
+        parsed, so forms and plain text skip the attempt; the body is
+        decoded to text at most once.
+        """
+        if "json" in content_type or _JSON_START.match(body):
             try:
-                self.handlers[endpoint.handler](event)
-            except Exception:
+                payload = _loads(body)
+                if isinstance(payload, dict):
+                    return payload
+                return {"data": payload}
+            except ValueError:
                 pass
+        return {"raw": body.decode('utf-8', errors='replace')}
+    
+    def _dispatch(self, handler: Callable, event: WebhookEvent):
+        """
+        Run an event handler.
         
-        return event
+        Inside the server's event loop, coroutine handlers become tasks
+        and plain handlers run in the default executor, so a slow handler
+        never holds up the next request.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        try:
+            if loop is None:
+                result = handler(event)
+                if asyncio.iscoroutine(result):
+                    asyncio.run(result)
+                return
+            
+            if asyncio.iscoroutinefunction(handler):
+                task = loop.create_task(handler(event))
+            else:
+                task = loop.run_in_executor(None, handler, event)
+        except Exception:
+            logger.exception("Webhook handler failed for %s", event.id)
+            return
+        
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_done)
+    
+    def _handler_done(self, task: asyncio.Future):
+        self._handler_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Webhook handler failed", exc_info=task.exception())
     
     def get_recent_events(self, limit: int = 20) -> List[WebhookEvent]:
         """Get recent webhook events."""
-        return self.events[-limit:]
+        return list(islice(self.events, max(0, len(self.events) - limit), None))
     
-    def start_server(self):
-        """Start the webhook server."""
-        if self._server:
+    async def _handle_request(self, request: "web.Request") -> "web.Response":
+        """aiohttp handler for every incoming webhook POST."""
+        body = await request.read()
+        event = self.handle_event(request.path, body, request.headers)
+        return web.json_response({"received": event.id})
+    
+    async def start(self):
+        """Start the webhook server on the running event loop."""
+        if self._runner:
             return
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp not installed. Run: pip install aiohttp")
         
-        manager = self
+        app = web.Application()
+        # One catch-all route, so endpoints registered later are served too
+        app.router.add_post("/{path:.*}", self._handle_request)
         
-        class WebhookHandler(BaseHTTPRequestHandler):
-            def do_POST(self):
-                content_length = int(self.headers.get('Content-Length', 0))
-                body = self.rfile.read(content_length)
-                
-                try:
-                    payload = json.loads(body.decode('utf-8'))
-                except:
-                    payload = {"raw": body.decode('utf-8', errors='replace')}
-                
-                headers = dict(self.headers)
-                event = manager.handle_event(self.path, payload, headers)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                response = {"received": event.id}
-                self.wfile.write(json.dumps(response).encode())
-            
-            def log_message(self, *args):
-                pass  # Suppress logging
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+    
+    async def stop(self):
+        """Stop the webhook server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def start_server(self):
+        """
+        Start the webhook server.
         
-        self._server = HTTPServer((self.host, self.port), WebhookHandler)
+        Called from a running event loop the server is scheduled on that
+        loop; otherwise it gets a loop of its own in a daemon thread.
+        """
+        if self._runner or self._server_thread:
+            return
         
-        def run():
-            self._server.serve_forever()
+        try:
+            asyncio.get_running_loop().create_task(self.start())
+            return
+        except RuntimeError:
+            pass
         
-        self._server_thread = threading.Thread(target=run, daemon=True)
+        self._server_loop = _new_event_loop()
+        self._server_loop.run_until_complete(self.start())
+        self._server_thread = threading.Thread(
+            target=self._server_loop.run_forever,
+            daemon=True,
+        )
         self._server_thread.start()
     
     def stop_server(self):
         """Stop the webhook server."""
-        if self._server:
-            self._server.shutdown()
-            self._server = None
+        if self._server_loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._server_loop).result()
+            self._server_loop.call_soon_threadsafe(self._server_loop.stop)
+            self._server_thread.join()
+            self._server_loop.close()
+            self._server_loop = None
+            self._server_thread = None
+        elif self._runner:
+            asyncio.get_running_loop().create_task(self.stop())
     
     def get_webhook_url(self, endpoint_name: str) -> str:
         """Get the full URL for a webhook endpoint."""
@@ -277,6 +459,22 @@ class WebhookManager:
         return f"http://{self.host}:{self.port}/{path}"
 
 
+# Singleton
+_webhook_manager: Optional[WebhookManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_webhook_manager() -> WebhookManager:
+    """Get or create webhook manager singleton, picking up on-disk changes."""
+    global _webhook_manager
+    with _manager_lock:
+        if _webhook_manager is None:
+            _webhook_manager = WebhookManager()
+        else:
+            _webhook_manager.reload_if_changed()
+        return _webhook_manager
+
+
 from tools.registry import tool, ToolResult
 
 
@@ -288,7 +486,7 @@ from tools.registry import tool, ToolResult
 def register_webhook(name: str, path: str, secret: str = None) -> ToolResult:
     """Register webhook."""
     try:
-        manager = WebhookManager()
+        manager = get_webhook_manager()
         config = manager.register_endpoint(name, path, secret)
         url = manager.get_webhook_url(name)
         
@@ -312,7 +510,7 @@ def register_webhook(name: str, path: str, secret: str = None) -> ToolResult:
 def list_webhooks() -> ToolResult:
     """List webhooks."""
     try:
-        manager = WebhookManager()
+        manager = get_webhook_manager()
         
         webhooks = [
             {
@@ -336,7 +534,7 @@ def list_webhooks() -> ToolResult:
 def recent_webhook_events(limit: int = 10) -> ToolResult:
     """Get recent events."""
     try:
-        manager = WebhookManager()
+        manager = get_webhook_manager()
         events = manager.get_recent_events(limit)
         
         return ToolResult(
@@ -367,7 +565,7 @@ if __name__ == "__main__":
     # Simulate event
     event = manager.handle_event(
         "/github",
-        {"action": "push", "repository": "test/repo"},
+        b'{"action": "push", "repository": "test/repo"}',
         {"X-Event-Type": "push", "X-Hub-Signature-256": "sha256=..."},
     )
     print(f"Event: {event.id} - {event.event_type}")
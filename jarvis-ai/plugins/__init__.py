@@ -4,12 +4,37 @@ JARVIS Plugin System - Extensible plugin architecture.
 Allows loading external plugins to extend JARVIS functionality.
 """
 
-from .loader import PluginLoader, Plugin, PluginMetadata
-from .manager import PluginManager
+import importlib
 
 __all__ = [
     "PluginLoader",
     "Plugin",
     "PluginMetadata",
     "PluginManager",
+    "register_plugin",
+    "get_plugin_manager",
 ]
+
+# Public names are imported on first access (PEP 562), so plugins that
+# only need the Plugin base class never load the manager.
+_LAZY_IMPORTS = {
+    "PluginLoader": ".loader",
+    "Plugin": ".loader",
+    "PluginMetadata": ".loader",
+    "PluginManager": ".manager",
+    "register_plugin": ".loader",
+    "get_plugin_manager": ".manager",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache, so __getattr__ runs once per name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,19 +5,20 @@ Demonstrates a simple JARVIS plugin.
 """
 
 import random
+import functools
+from datetime import date, datetime
 from typing import Dict, List
 
-# Import from parent
-import sys
-sys.path.insert(0, '../../../')
+if __name__ == "__main__":
+    # Standalone run: make the jarvis-ai root importable
+    import os
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-try:
-    from plugins.loader import Plugin
-except ImportError:
-    class Plugin:
-        def __init__(self, context=None): pass
+from plugins.loader import Plugin, register_plugin
 
 
+@register_plugin
 class QuotePlugin(Plugin):
     """
     Inspirational quotes plugin.
@@ -47,6 +48,11 @@ class QuotePlugin(Plugin):
         "wisdom": [2, 5, 6, 10, 11, 14],
     }
     
+    def __init__(self, jarvis_context: Dict = None):
+        super().__init__(jarvis_context)
+        # Own generator, so concurrent calls don't share the module RNG
+        self._rng = random.Random()
+    
     def get_name(self) -> str:
         return "Daily Quote"
     
@@ -81,11 +87,11 @@ class QuotePlugin(Plugin):
         Returns:
             Quote dict
         """
-        if category and category.lower() in self.CATEGORIES:
-            indices = self.CATEGORIES[category.lower()]
-            quote = self.QUOTES[random.choice(indices)]
+        quotes = self._CATEGORY_QUOTES.get(category.lower()) if category else None
+        if quotes:
+            quote = self._rng.choice(quotes)
         else:
-            quote = random.choice(self.QUOTES)
+            quote = self._rng.choice(self.QUOTES)
         
         return {
             "quote": quote["quote"],
@@ -94,22 +100,34 @@ class QuotePlugin(Plugin):
     
     def quote_of_the_day(self) -> Dict:
         """Get quote based on current day."""
-        from datetime import datetime
-        
-        day_of_year = datetime.now().timetuple().tm_yday
-        index = day_of_year % len(self.QUOTES)
-        quote = self.QUOTES[index]
+        return dict(self._quote_for_day(datetime.now().date()))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _quote_for_day(cls, day: date) -> Dict:
+        """Build the quote of the day once per date."""
+        day_of_year = day.timetuple().tm_yday
+        index = day_of_year % len(cls.QUOTES)
+        quote = cls.QUOTES[index]
         
         return {
             "quote": quote["quote"],
             "author": quote["author"],
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "date": day.strftime("%Y-%m-%d"),
         }
     
     def on_load(self):
         print(f"[Quote Plugin] Loaded with {len(self.QUOTES)} quotes")
 
 
+# Quotes per category, resolved once. Built after the class body because
+# comprehensions there cannot see QUOTES.
+QuotePlugin._CATEGORY_QUOTES = {
+    category.lower(): [QuotePlugin.QUOTES[i] for i in indices]
+    for category, indices in QuotePlugin.CATEGORIES.items()
+}
+
+
 if __name__ == "__main__":
     print("Testing Quote Plugin...")
     
@@ -4,25 +4,36 @@ Weather Plugin - Get weather information.
 Demonstrates plugin creation for JARVIS.
 """
 
+import gzip
 import json
+import time
+import urllib.parse
 import urllib.request
-from typing import Dict, List, Optional
-
-# Import from parent - adjust path as needed
-import sys
-sys.path.insert(0, '../../../')
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
-    from plugins.loader import Plugin
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    # Fallback for standalone testing
-    class Plugin:
-        def __init__(self, context=None): pass
-        def get_name(self): return ""
-        def get_description(self): return ""
-        def get_tools(self): return []
+    ORJSON_AVAILABLE = False
+
+if __name__ == "__main__":
+    # Standalone run: make the jarvis-ai root importable
+    import os
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from plugins.loader import Plugin, register_plugin
 
 
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@register_plugin
 class WeatherPlugin(Plugin):
     """
     Weather information plugin.
@@ -31,7 +42,14 @@ class WeatherPlugin(Plugin):
     """
     
     # Free weather API (wttr.in)
-    WEATHER_API = "https://wttr.in/{location}?format=j1"
+    _URL_PREFIX = "https://wttr.in/"
+    _URL_SUFFIX = "?format=j1"
+    
+    # wttr.in returns current conditions and forecast in one document, so
+    # get_weather and get_forecast share a single cached fetch per location.
+    _CACHE: Dict[str, Tuple[float, dict]] = {}
+    _TTL = 600
+    TIMEOUT = 5
     
     def get_name(self) -> str:
         return "Weather"
@@ -63,6 +81,25 @@ class WeatherPlugin(Plugin):
             },
         ]
     
+    def _fetch(self, location: str) -> dict:
+        """Fetch (or reuse) the wttr.in JSON document for a location."""
+        key = location.strip().lower()
+        cached = self._CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < self._TTL:
+            return cached[1]
+        
+        url = self._URL_PREFIX + urllib.parse.quote_plus(location) + self._URL_SUFFIX
+        request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        
+        with urllib.request.urlopen(request, timeout=self.TIMEOUT) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+        
+        data = _loads(body)
+        self._CACHE[key] = (time.monotonic(), data)
+        return data
+    
     def get_weather(self, location: str = "London") -> Dict:
         """
         Get current weather for a location.
@@ -74,10 +111,7 @@ class WeatherPlugin(Plugin):
             Weather data dict
         """
         try:
-            url = self.WEATHER_API.format(location=location.replace(" ", "+"))
-            
-            with urllib.request.urlopen(url, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            data = self._fetch(location)
             
             current = data.get("current_condition", [{}])[0]
             area = data.get("nearest_area", [{}])[0]
@@ -113,10 +147,7 @@ class WeatherPlugin(Plugin):
             Forecast data
         """
         try:
-            url = self.WEATHER_API.format(location=location.replace(" ", "+"))
-            
-            with urllib.request.urlopen(url, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            data = self._fetch(location)
             
             forecasts = []
             for day in data.get("weather", [])[:days]:
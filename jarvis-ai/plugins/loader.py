@@ -9,14 +9,30 @@ import sys
 import json
 import importlib
 import importlib.util
+import threading
+import contextlib
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, FrozenSet, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True, frozen=True)
 class PluginMetadata:
     """Plugin metadata from plugin.json."""
     name: str
@@ -30,7 +46,7 @@ class PluginMetadata:
     enabled: bool = True
     
 
-@dataclass
+@dataclass(slots=True)
 class PluginInfo:
     """Runtime plugin information."""
     metadata: PluginMetadata
@@ -40,6 +56,11 @@ class PluginInfo:
     error: Optional[str] = None
 
 
+# Plugin classes keyed by the module that defines them, filled in at class
+# creation (first concrete subclass) or by @register_plugin.
+_PLUGIN_REGISTRY: Dict[str, type] = {}
+
+
 class Plugin(ABC):
     """
     Base class for JARVIS plugins.
@@ -59,6 +80,17 @@ class Plugin(ABC):
         self.llm = self.context.get("llm")
         self.memory = self.context.get("memory")
     
+    def __init_subclass__(cls, **kwargs):
+        """Register the first concrete, public subclass defined in a module."""
+        super().__init_subclass__(**kwargs)
+        # __abstractmethods__ isn't computed yet, so check the methods directly
+        if cls.__name__.startswith('_') or any(
+            getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+            for name in Plugin.__abstractmethods__
+        ):
+            return
+        _PLUGIN_REGISTRY.setdefault(cls.__module__, cls)
+    
     @abstractmethod
     def get_name(self) -> str:
         """Return plugin name."""
@@ -104,6 +136,35 @@ class Plugin(ABC):
         return None
 
 
+def register_plugin(cls: type) -> type:
+    """
+    Mark the class the loader should instantiate for a module.
+    
+    Concrete subclasses register themselves; the decorator is only needed
+    to pick a class other than the first one defined.
+    
+    Usage:
+        @register_plugin
+        class MyPlugin(Plugin):
+            ...
+    """
+    _PLUGIN_REGISTRY[cls.__module__] = cls
+    return cls
+
+
+@contextlib.contextmanager
+def _plugin_syspath(path: str):
+    """Put a plugin directory on sys.path only while its entry point runs."""
+    sys.path.insert(0, path)
+    try:
+        yield
+    finally:
+        try:
+            sys.path.remove(path)
+        except ValueError:
+            pass
+
+
 class PluginLoader:
     """
     Load plugins from the plugins directory.
@@ -131,6 +192,19 @@ class PluginLoader:
         
         self.loaded_plugins: Dict[str, PluginInfo] = {}
         self.plugin_instances: Dict[str, Plugin] = {}
+        
+        # plugin.json parses, keyed by the mtime they were read at
+        self._meta_cache: Dict[str, Tuple[int, PluginMetadata]] = {}
+        
+        # Guards sys.path/exec_module and the plugin dicts while
+        # load_all_plugins loads plugins on worker threads
+        self._lock = threading.Lock()
+        
+        # Aggregated plugin tools, dropped whenever plugin_instances changes
+        self._tools_cache: Optional[List[Dict]] = None
+        
+        # Plugins switched off by the manager's config, on top of plugin.json
+        self.disabled: FrozenSet[str] = frozenset()
     
     def discover_plugins(self) -> List[str]:
         """
@@ -141,27 +215,35 @@ class PluginLoader:
         """
         plugins = []
         
-        for item in self.plugins_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('_'):
-                plugin_json = item / "plugin.json"
-                if plugin_json.exists():
-                    plugins.append(item.name)
+        # DirEntry.is_dir() answers from the readdir d_type without a stat
+        with os.scandir(self.plugins_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('_') or not entry.is_dir():
+                    continue
+                if os.path.exists(os.path.join(entry.path, "plugin.json")):
+                    plugins.append(entry.name)
         
         return plugins
     
     def load_metadata(self, plugin_name: str) -> Optional[PluginMetadata]:
-        """Load plugin metadata from plugin.json."""
+        """Load plugin metadata from plugin.json, reusing unchanged parses."""
         plugin_path = self.plugins_dir / plugin_name
         plugin_json = plugin_path / "plugin.json"
         
-        if not plugin_json.exists():
+        try:
+            mtime = plugin_json.stat().st_mtime_ns
+        except OSError:
             return None
         
+        cached = self._meta_cache.get(plugin_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
         try:
-            with open(plugin_json, 'r') as f:
-                data = json.load(f)
+            with open(plugin_json, 'rb') as f:
+                data = _loads(f.read())
             
-            return PluginMetadata(
+            metadata = PluginMetadata(
                 name=data.get("name", plugin_name),
                 version=data.get("version", "1.0.0"),
                 description=data.get("description", ""),
@@ -174,6 +256,9 @@ class PluginLoader:
             )
         except Exception:
             return None
+        
+        self._meta_cache[plugin_name] = (mtime, metadata)
+        return metadata
     
     def load_plugin(
         self,
@@ -195,77 +280,84 @@ class PluginLoader:
         if not metadata:
             return None
         
-        if not metadata.enabled:
-            self.loaded_plugins[plugin_name] = PluginInfo(
-                metadata=metadata,
-                path=str(self.plugins_dir / plugin_name),
-                loaded_at=datetime.now(),
-                status="disabled",
-            )
+        if not metadata.enabled or plugin_name in self.disabled:
+            with self._lock:
+                self.loaded_plugins[plugin_name] = PluginInfo(
+                    metadata=metadata,
+                    path=str(self.plugins_dir / plugin_name),
+                    loaded_at=datetime.now(),
+                    status="disabled",
+                )
             return None
         
         plugin_path = self.plugins_dir / plugin_name
         entry_file = plugin_path / metadata.entry_point
         
         if not entry_file.exists():
-            self.loaded_plugins[plugin_name] = PluginInfo(
-                metadata=metadata,
-                path=str(plugin_path),
-                loaded_at=datetime.now(),
-                status="error",
-                error=f"Entry point not found: {metadata.entry_point}",
-            )
+            with self._lock:
+                self.loaded_plugins[plugin_name] = PluginInfo(
+                    metadata=metadata,
+                    path=str(plugin_path),
+                    loaded_at=datetime.now(),
+                    status="error",
+                    error=f"Entry point not found: {metadata.entry_point}",
+                )
             return None
         
         try:
-            # Add plugin path to sys.path
-            plugin_path_str = str(plugin_path)
-            if plugin_path_str not in sys.path:
-                sys.path.insert(0, plugin_path_str)
-            
-            # Load module
-            spec = importlib.util.spec_from_file_location(
-                f"jarvis_plugin_{plugin_name}",
-                entry_file,
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # sys.path is process-wide, so imports are serialised
+            with self._lock:
+                # Load module with the plugin directory importable
+                spec = importlib.util.spec_from_file_location(
+                    f"jarvis_plugin_{plugin_name}",
+                    entry_file,
+                )
+                module = importlib.util.module_from_spec(spec)
+                # Drop the class from a previous load so a reload registers anew
+                _PLUGIN_REGISTRY.pop(module.__name__, None)
+                with _plugin_syspath(str(plugin_path)):
+                    spec.loader.exec_module(module)
             
-            # Find Plugin subclass
-            plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, Plugin) and 
-                    attr is not Plugin):
-                    plugin_class = attr
-                    break
+            # Find Plugin subclass, scanning only if none was registered
+            plugin_class = _PLUGIN_REGISTRY.get(module.__name__)
+            if plugin_class is None:
+                for attr_name, attr in vars(module).items():
+                    if attr_name.startswith('_'):
+                        continue
+                    if (isinstance(attr, type) and 
+                        attr is not Plugin and 
+                        issubclass(attr, Plugin)):
+                        plugin_class = attr
+                        break
             
             if not plugin_class:
                 raise ValueError("No Plugin subclass found")
             
-            # Instantiate plugin
+            # Instantiate plugin (on_load runs unlocked, it may do I/O)
             instance = plugin_class(jarvis_context)
             instance.on_load()
             
-            self.plugin_instances[plugin_name] = instance
-            self.loaded_plugins[plugin_name] = PluginInfo(
-                metadata=metadata,
-                path=str(plugin_path),
-                loaded_at=datetime.now(),
-                status="loaded",
-            )
+            with self._lock:
+                self.plugin_instances[plugin_name] = instance
+                self._tools_cache = None
+                self.loaded_plugins[plugin_name] = PluginInfo(
+                    metadata=metadata,
+                    path=str(plugin_path),
+                    loaded_at=datetime.now(),
+                    status="loaded",
+                )
             
             return instance
         
         except Exception as e:
-            self.loaded_plugins[plugin_name] = PluginInfo(
-                metadata=metadata,
-                path=str(plugin_path),
-                loaded_at=datetime.now(),
-                status="error",
-                error=str(e),
-            )
+            with self._lock:
+                self.loaded_plugins[plugin_name] = PluginInfo(
+                    metadata=metadata,
+                    path=str(plugin_path),
+                    loaded_at=datetime.now(),
+                    status="error",
+                    error=str(e),
+                )
             return None
     
     def unload_plugin(self, plugin_name: str) -> bool:
@@ -277,6 +369,7 @@ class PluginLoader:
                 pass
             
             del self.plugin_instances[plugin_name]
+            self._tools_cache = None
             
             if plugin_name in self.loaded_plugins:
                 self.loaded_plugins[plugin_name].status = "unloaded"
@@ -285,11 +378,18 @@ class PluginLoader:
         return False
     
     def load_all_plugins(self, jarvis_context: Dict = None) -> Dict[str, Plugin]:
-        """Load all discovered plugins."""
+        """Load all discovered plugins, overlapping their on_load hooks."""
         plugins = self.discover_plugins()
         
-        for plugin_name in plugins:
-            self.load_plugin(plugin_name, jarvis_context)
+        if len(plugins) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(plugins))) as executor:
+                list(executor.map(
+                    lambda name: self.load_plugin(name, jarvis_context),
+                    plugins,
+                ))
+        else:
+            for plugin_name in plugins:
+                self.load_plugin(plugin_name, jarvis_context)
         
         return self.plugin_instances
     
@@ -308,19 +408,22 @@ class PluginLoader:
             return []
     
     def get_all_plugin_tools(self) -> List[Dict]:
-        """Get all tools from all loaded plugins."""
+        """Get all tools from all loaded plugins (cached until a load/unload)."""
+        if self._tools_cache is not None:
+            return list(self._tools_cache)
+        
         tools = []
         
-        for plugin_name, instance in self.plugin_instances.items():
+        for plugin_name, instance in list(self.plugin_instances.items()):
             try:
-                plugin_tools = instance.get_tools()
-                for tool in plugin_tools:
-                    tool["plugin"] = plugin_name
-                tools.extend(plugin_tools)
-            except:
+                for tool in instance.get_tools():
+                    tool.setdefault("plugin", plugin_name)
+                    tools.append(tool)
+            except Exception:
                 pass
         
-        return tools
+        self._tools_cache = tools
+        return list(tools)
 
 
 if __name__ == "__main__":
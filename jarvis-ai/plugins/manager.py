@@ -7,13 +7,78 @@ Handles plugin lifecycle, tool registration, and updates.
 import os
 import json
 import shutil
+import string
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from .loader import PluginLoader, Plugin, PluginMetadata, PluginInfo
 
 
+def _dumps(obj: Any) -> bytes:
+    """Encode to indented JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Source for create_plugin_template's main.py; $name and $class_name are
+# filled in, everything else (braces included) is written as-is
+_MAIN_PY_TEMPLATE = string.Template('''"""
+$name - A JARVIS Plugin
+"""
+
+from plugins.loader import Plugin
+
+
+class ${class_name}Plugin(Plugin):
+    """Main plugin class."""
+    
+    def get_name(self) -> str:
+        return "$name"
+    
+    def get_description(self) -> str:
+        return "Description of your plugin"
+    
+    def get_tools(self) -> list:
+        return [
+            {
+                "name": "example_tool",
+                "description": "An example tool",
+                "handler": self.example_tool,
+                "parameters": {"text": "string"},
+            },
+        ]
+    
+    def example_tool(self, text: str = "Hello") -> str:
+        """Example tool implementation."""
+        return f"Plugin says: {text}"
+    
+    def on_load(self):
+        """Called when plugin is loaded."""
+        print(f"{self.get_name()} loaded!")
+    
+    def on_unload(self):
+        """Called when plugin is unloaded."""
+        print(f"{self.get_name()} unloaded!")
+''')
+
+
 class PluginManager:
     """
     Manage JARVIS plugins.
@@ -44,21 +109,33 @@ class PluginManager:
         self.loader = PluginLoader(str(self.plugins_dir))
         self.config: Dict = {}
         
+        # Plugins whose tools are currently in the tool registry
+        self._registered: Set[str] = set()
+        
         self._load_config()
     
     def _load_config(self):
         """Load plugin configuration."""
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, 'r') as f:
-                    self.config = json.load(f)
-            except:
-                self.config = {}
+        try:
+            self.config = _loads(self.config_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except:
+            self.config = {}
+        
+        self._sync_disabled()
+    
+    def _sync_disabled(self):
+        """Rebuild the disabled lookup set after the config list changes."""
+        self._disabled = frozenset(self.config.get("disabled", []))
+        self.loader.disabled = self._disabled
     
     def _save_config(self):
-        """Save plugin configuration."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        """Save plugin configuration (atomically, via a temp file)."""
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps(self.config))
+        os.replace(tmp_path, self.config_path)
     
     def initialize(self, jarvis_context: Dict = None):
         """
@@ -71,29 +148,43 @@ class PluginManager:
         self._register_plugin_tools()
     
     def _register_plugin_tools(self):
-        """Register plugin tools with the main tool registry."""
+        """Register tools of loaded plugins that aren't registered yet."""
+        for plugin_name, instance in list(self.loader.plugin_instances.items()):
+            if plugin_name not in self._registered:
+                self._register_plugin(plugin_name, instance)
+    
+    def _register_plugin(self, plugin_name: str, instance: Plugin):
+        """Register one plugin's tools with the main tool registry."""
         try:
             from tools.registry import get_registry, Tool, RiskLevel
-            registry = get_registry()
-            
-            for plugin_name, instance in self.loader.plugin_instances.items():
-                try:
-                    tools = instance.get_tools()
-                    
-                    for tool_def in tools:
-                        tool = Tool(
-                            name=f"plugin_{plugin_name}_{tool_def['name']}",
-                            description=tool_def.get('description', ''),
-                            handler=tool_def['handler'],
-                            parameters=tool_def.get('parameters', {}),
-                            category=f"plugin:{plugin_name}",
-                            risk_level=RiskLevel.LOW,
-                        )
-                        registry.register(tool)
-                except Exception as e:
-                    print(f"Failed to register tools from {plugin_name}: {e}")
         except ImportError:
-            pass
+            return
+        
+        registry = get_registry()
+        try:
+            for tool_def in instance.get_tools():
+                tool = Tool(
+                    name=f"plugin_{plugin_name}_{tool_def['name']}",
+                    description=tool_def.get('description', ''),
+                    handler=tool_def['handler'],
+                    category=f"plugin:{plugin_name}",
+                    risk_level=RiskLevel.LOW,
+                )
+                registry.register(tool)
+            self._registered.add(plugin_name)
+        except Exception as e:
+            print(f"Failed to register tools from {plugin_name}: {e}")
+    
+    def _unregister_plugin(self, plugin_name: str):
+        """Remove one plugin's tools from the main tool registry."""
+        if plugin_name not in self._registered:
+            return
+        self._registered.discard(plugin_name)
+        try:
+            from tools.registry import get_registry
+        except ImportError:
+            return
+        get_registry().unregister_category(f"plugin:{plugin_name}")
     
     def list_plugins(self) -> List[Dict]:
         """List all available plugins."""
@@ -102,9 +193,18 @@ class PluginManager:
         discovered = self.loader.discover_plugins()
         loaded = self.loader.get_loaded_plugins()
         
+        # Loaded plugins already carry their metadata; the rest are read
+        # (mtime-cached by the loader) in parallel, overlapping file I/O
+        unloaded = [name for name in discovered if name not in loaded]
+        if len(unloaded) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(unloaded))) as executor:
+                metas = dict(zip(unloaded, executor.map(self.loader.load_metadata, unloaded)))
+        else:
+            metas = {name: self.loader.load_metadata(name) for name in unloaded}
+        
         for name in discovered:
             info = loaded.get(name)
-            metadata = self.loader.load_metadata(name)
+            metadata = info.metadata if info else metas[name]
             
             plugins.append({
                 "name": name,
@@ -128,17 +228,18 @@ class PluginManager:
         
         if name in self.config["disabled"]:
             self.config["disabled"].remove(name)
+            self._sync_disabled()
             self._save_config()
         
-        # Update plugin.json
-        plugin_json = self.plugins_dir / name / "plugin.json"
-        if plugin_json.exists():
+        # The config is the source of truth; plugin.json is only rewritten
+        # for plugins that older versions disabled there
+        metadata = self.loader.load_metadata(name)
+        if metadata and not metadata.enabled:
+            plugin_json = self.plugins_dir / name / "plugin.json"
             try:
-                with open(plugin_json, 'r') as f:
-                    data = json.load(f)
+                data = _loads(plugin_json.read_bytes())
                 data["enabled"] = True
-                with open(plugin_json, 'w') as f:
-                    json.dump(data, f, indent=2)
+                plugin_json.write_bytes(_dumps(data))
             except:
                 pass
         
@@ -150,37 +251,27 @@ class PluginManager:
         
         if name not in self.config["disabled"]:
             self.config["disabled"].append(name)
+            self._sync_disabled()
             self._save_config()
         
         # Unload if loaded
         self.loader.unload_plugin(name)
-        
-        # Update plugin.json
-        plugin_json = self.plugins_dir / name / "plugin.json"
-        if plugin_json.exists():
-            try:
-                with open(plugin_json, 'r') as f:
-                    data = json.load(f)
-                data["enabled"] = False
-                with open(plugin_json, 'w') as f:
-                    json.dump(data, f, indent=2)
-            except:
-                pass
+        self._unregister_plugin(name)
         
         return True
     
     def is_enabled(self, name: str) -> bool:
         """Check if plugin is enabled."""
-        disabled = self.config.get("disabled", [])
-        return name not in disabled
+        return name not in self._disabled
     
     def reload_plugin(self, name: str, jarvis_context: Dict = None) -> bool:
         """Reload a plugin."""
         self.loader.unload_plugin(name)
+        self._unregister_plugin(name)
         instance = self.loader.load_plugin(name, jarvis_context)
         
         if instance:
-            self._register_plugin_tools()
+            self._register_plugin(name, instance)
             return True
         return False
     
@@ -196,21 +287,21 @@ class PluginManager:
         """
         source = Path(source_dir)
         
-        if not (source / "plugin.json").exists():
-            return None
-        
-        # Get plugin name from metadata
+        # Get plugin name from metadata (no plugin.json, not a plugin)
         try:
-            with open(source / "plugin.json", 'r') as f:
-                data = json.load(f)
+            data = _loads((source / "plugin.json").read_bytes())
             plugin_name = data.get("name", source.name)
+        except FileNotFoundError:
+            return None
         except:
             plugin_name = source.name
         
         # Copy to plugins directory
         dest = self.plugins_dir / plugin_name.lower().replace(" ", "_")
-        if dest.exists():
+        try:
             shutil.rmtree(dest)
+        except FileNotFoundError:
+            pass
         
         shutil.copytree(source, dest)
         
@@ -219,12 +310,13 @@ class PluginManager:
     def uninstall_plugin(self, name: str) -> bool:
         """Uninstall a plugin."""
         self.loader.unload_plugin(name)
+        self._unregister_plugin(name)
         
-        plugin_path = self.plugins_dir / name
-        if plugin_path.exists():
-            shutil.rmtree(plugin_path)
-            return True
-        return False
+        try:
+            shutil.rmtree(self.plugins_dir / name)
+        except FileNotFoundError:
+            return False
+        return True
     
     def create_plugin_template(self, name: str) -> str:
         """
@@ -241,58 +333,37 @@ class PluginManager:
         plugin_path.mkdir(parents=True, exist_ok=True)
         
         # plugin.json
-        with open(plugin_path / "plugin.json", 'w') as f:
-            json.dump({
-                "name": name,
-                "version": "1.0.0",
-                "description": f"A JARVIS plugin: {name}",
-                "author": "Your Name",
-                "entry_point": "main.py",
-                "enabled": True,
-            }, f, indent=2)
+        (plugin_path / "plugin.json").write_bytes(_dumps({
+            "name": name,
+            "version": "1.0.0",
+            "description": f"A JARVIS plugin: {name}",
+            "author": "Your Name",
+            "entry_point": "main.py",
+            "enabled": True,
+        }))
         
         # main.py
-        with open(plugin_path / "main.py", 'w') as f:
-            f.write(f'''"""
-{name} - A JARVIS Plugin
-"""
+        (plugin_path / "main.py").write_text(_MAIN_PY_TEMPLATE.substitute(
+            name=name,
+            class_name=safe_name.title().replace("_", ""),
+        ), encoding="utf-8")
+        
+        return str(plugin_path)
 
-from plugins.loader import Plugin
 
+# Singleton shared by the plugin tools, so each call reuses the parsed
+# config and loader state instead of rebuilding them
+_plugin_manager: Optional[PluginManager] = None
+_manager_lock = threading.Lock()
 
-class {safe_name.title().replace("_", "")}Plugin(Plugin):
-    """Main plugin class."""
-    
-    def get_name(self) -> str:
-        return "{name}"
-    
-    def get_description(self) -> str:
-        return "Description of your plugin"
-    
-    def get_tools(self) -> list:
-        return [
-            {{
-                "name": "example_tool",
-                "description": "An example tool",
-                "handler": self.example_tool,
-                "parameters": {{"text": "string"}},
-            }},
-        ]
-    
-    def example_tool(self, text: str = "Hello") -> str:
-        """Example tool implementation."""
-        return f"Plugin says: {{text}}"
-    
-    def on_load(self):
-        """Called when plugin is loaded."""
-        print(f"{{self.get_name()}} loaded!")
-    
-    def on_unload(self):
-        """Called when plugin is unloaded."""
-        print(f"{{self.get_name()}} unloaded!")
-''')
-        
-        return str(plugin_path)
+
+def get_plugin_manager() -> PluginManager:
+    """Get or create plugin manager singleton."""
+    global _plugin_manager
+    with _manager_lock:
+        if _plugin_manager is None:
+            _plugin_manager = PluginManager()
+        return _plugin_manager
 
 
 from tools.registry import tool, ToolResult
@@ -306,7 +377,7 @@ from tools.registry import tool, ToolResult
 def list_plugins() -> ToolResult:
     """List plugins."""
     try:
-        manager = PluginManager()
+        manager = get_plugin_manager()
         plugins = manager.list_plugins()
         
         return ToolResult(
@@ -325,7 +396,7 @@ def list_plugins() -> ToolResult:
 def enable_plugin(name: str) -> ToolResult:
     """Enable plugin."""
     try:
-        manager = PluginManager()
+        manager = get_plugin_manager()
         success = manager.enable_plugin(name)
         
         return ToolResult(
@@ -344,7 +415,7 @@ def enable_plugin(name: str) -> ToolResult:
 def disable_plugin(name: str) -> ToolResult:
     """Disable plugin."""
     try:
-        manager = PluginManager()
+        manager = get_plugin_manager()
         success = manager.disable_plugin(name)
         
         return ToolResult(
@@ -363,7 +434,7 @@ def disable_plugin(name: str) -> ToolResult:
 def create_plugin(name: str) -> ToolResult:
     """Create plugin template."""
     try:
-        manager = PluginManager()
+        manager = get_plugin_manager()
         path = manager.create_plugin_template(name)
         
         return ToolResult(
@@ -10,9 +10,13 @@ Usage:
     python scripts/install.py --minimal # Minimal for testing
 """
 
+import os
+import re
+import json
 import subprocess
 import sys
 import argparse
+import tempfile
 
 # Core dependencies (always needed)
 CORE_DEPS = [
@@ -28,6 +32,7 @@ CORE_DEPS = [
     "rich>=13.0.0",
     "python-dotenv>=1.0.0",
     "apscheduler>=3.10.0",
+    "argon2-cffi>=23.1.0",
 ]
 
 # AI/ML dependencies
@@ -79,27 +84,93 @@ OPTIONAL_DEPS = [
 ]
 
 
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--no-input"]
+
+# Distribution name at the start of a requirement spec ("numpy>=1.24.0")
+_REQ_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+def _canonical_name(name: str) -> str:
+    """Normalize a distribution name the way pip does (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _read_report(path: str) -> dict:
+    """Map canonical name -> version for everything a pip --report installed."""
+    try:
+        with open(path, 'rb') as f:
+            report = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return {
+        _canonical_name(item["metadata"]["name"]): item["metadata"]["version"]
+        for item in report.get("install", [])
+    }
+
+
+def _pip_install(args: list) -> subprocess.CompletedProcess:
+    """Run pip install quietly, capturing stderr for error reporting."""
+    # run() drains the pipe while waiting; check_call would block on a
+    # full stderr pipe that nobody reads
+    return subprocess.run(
+        PIP_INSTALL + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+
+
+def _print_stderr_tail(result: subprocess.CompletedProcess, lines: int = 5):
+    """Print the last few lines of pip's stderr, indented."""
+    for line in result.stderr.strip().splitlines()[-lines:]:
+        print(f"       {line}")
+
+
 def install_packages(packages: list, name: str, continue_on_error: bool = True):
-    """Install a group of packages."""
+    """
+    Install a group of packages.
+
+    The whole group goes to a single pip call (one startup, one resolver
+    pass), whose JSON report gives the per-package result. Only if that
+    call fails are packages retried one by one, to find out which ones
+    are broken.
+    """
     print(f"\n{'='*60}")
     print(f"Installing {name}...")
     print('='*60)
 
+    # pip's JSON report (pip 22.2+) says what the batch actually
+    # installed; anything not in it was already satisfied
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.json")
+        result = _pip_install(["--report", report_path] + list(packages))
+        installed = _read_report(report_path)
+
+    if result.returncode != 0:
+        print(f"  [FAILED] batch install, retrying packages individually")
+        _print_stderr_tail(result)
+    else:
+        for pkg in packages:
+            version = installed.get(_canonical_name(_REQ_NAME.match(pkg).group()))
+            status = f"installed {version}" if version else "already satisfied"
+            print(f"  -> {pkg}")
+            print(f"     [OK] {status}")
+        return []
+
     failed = []
     for pkg in packages:
-        try:
-            print(f"  -> {pkg}")
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install", pkg],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE,
-            )
+        print(f"  -> {pkg}")
+        result = _pip_install([pkg])
+        if result.returncode == 0:
             print(f"     [OK]")
-        except subprocess.CalledProcessError as e:
-            print(f"     [FAILED] {e}")
-            failed.append(pkg)
-            if not continue_on_error:
-                raise
+            continue
+
+        print(f"     [FAILED] pip exited with status {result.returncode}")
+        _print_stderr_tail(result)
+        failed.append(pkg)
+        if not continue_on_error:
+            result.check_returncode()
 
     if failed:
         print(f"\n  Warning: Failed to install: {', '.join(failed)}")
@@ -142,37 +213,38 @@ def main():
 
     all_failed = []
 
-    # Always install core
+    # Always install core first; the other groups build on it
     failed = install_packages(CORE_DEPS, "Core Dependencies")
     all_failed.extend(failed)
 
-    if not args.minimal:
-        # Memory
-        failed = install_packages(MEMORY_DEPS, "Memory Dependencies")
-        all_failed.extend(failed)
+    groups = []
 
-        # Server
-        failed = install_packages(SERVER_DEPS, "Server Dependencies")
-        all_failed.extend(failed)
+    if not args.minimal:
+        groups.append((MEMORY_DEPS, "Memory Dependencies"))
+        groups.append((SERVER_DEPS, "Server Dependencies"))
 
         # Windows specific
         if sys.platform == "win32":
-            failed = install_packages(WINDOWS_DEPS, "Windows Dependencies")
-            all_failed.extend(failed)
+            groups.append((WINDOWS_DEPS, "Windows Dependencies"))
 
     if not args.core and not args.minimal:
-        # AI deps
-        failed = install_packages(AI_DEPS, "AI Dependencies")
-        all_failed.extend(failed)
+        groups.append((AI_DEPS, "AI Dependencies"))
 
         # Audio (optional, may fail)
         if not args.skip_audio:
-            failed = install_packages(AUDIO_DEPS, "Audio Dependencies")
-            all_failed.extend(failed)
+            groups.append((AUDIO_DEPS, "Audio Dependencies"))
 
     if args.dev:
-        failed = install_packages(DEV_DEPS, "Development Dependencies")
-        all_failed.extend(failed)
+        groups.append((DEV_DEPS, "Development Dependencies"))
+
+    # The groups share dependencies (chromadb pulls fastapi/uvicorn,
+    # sentence-transformers and whisper both pull torch), so resolve them
+    # together in one pip call rather than racing separate installs into
+    # the same site-packages
+    if groups:
+        packages = [pkg for group, _ in groups for pkg in group]
+        name = ", ".join(group_name for _, group_name in groups)
+        all_failed.extend(install_packages(packages, name))
 
     # Check Ollama
     print("\n" + "=" * 60)
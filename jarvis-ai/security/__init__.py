@@ -5,7 +5,7 @@ Provides cryptographic utilities for data protection.
 """
 
 from .encryption import EncryptionManager, SecureStorage
-from .auth import AuthManager, UserSession
+from .auth import AuthManager, UserSession, get_auth_manager
 from .vault import PasswordVault
 
 __all__ = [
@@ -13,5 +13,6 @@ __all__ = [
     "SecureStorage",
     "AuthManager",
     "UserSession",
+    "get_auth_manager",
     "PasswordVault",
 ]
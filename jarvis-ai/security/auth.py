@@ -6,13 +6,44 @@ Provides local user authentication with PIN/password support.
 
 import os
 import json
+import atexit
 import secrets
+import hmac
+import heapq
 import hashlib
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode to indented JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class UserSession:
@@ -52,6 +83,7 @@ class AuthManager:
     
     SESSION_DURATION = timedelta(hours=8)
     LOCK_TIMEOUT = timedelta(minutes=15)
+    SAVE_DELAY = 2.0  # seconds to coalesce non-critical saves (last_login)
     
     def __init__(
         self,
@@ -67,18 +99,28 @@ class AuthManager:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
         self.users: Dict[str, UserProfile] = {}
+        self._by_username: Dict[str, str] = {}  # lowercase username -> user_id
         self.sessions: Dict[str, UserSession] = {}
         self.current_session: Optional[UserSession] = None
+        self._expiry_heap: List[Tuple[datetime, str]] = []  # (expires_at, session_id)
+        
+        # Deferred save state for _mark_dirty
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.RLock()  # held by every save and users change
+        
+        if ARGON2_AVAILABLE:
+            self._argon2 = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
         
         self._load()
+        atexit.register(self.flush)
     
     def _load(self):
         """Load auth data."""
         users_file = self.storage_path / "users.json"
         if users_file.exists():
             try:
-                with open(users_file, 'r') as f:
-                    data = json.load(f)
+                data = _loads(users_file.read_bytes())
                 
                 for user_data in data:
                     user_data['created_at'] = datetime.fromisoformat(user_data['created_at'])
@@ -86,46 +128,116 @@ class AuthManager:
                         user_data['last_login'] = datetime.fromisoformat(user_data['last_login'])
                     user = UserProfile(**user_data)
                     self.users[user.user_id] = user
+                    self._by_username[user.username.lower()] = user.user_id
             except Exception:
                 pass
     
     def _save(self):
-        """Save auth data."""
+        """Save auth data (atomically, via a temp file)."""
         users_file = self.storage_path / "users.json"
-        
-        data = []
-        for user in self.users.values():
-            user_dict = asdict(user)
-            user_dict['created_at'] = user.created_at.isoformat()
-            if user.last_login:
-                user_dict['last_login'] = user.last_login.isoformat()
-            data.append(user_dict)
-        
-        with open(users_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp_file = users_file.with_name(users_file.name + ".tmp")
+        
+        # The timer thread and callers share one tmp path, so saves must
+        # not overlap; the lock also keeps users stable while serializing
+        with self._save_lock:
+            data = []
+            for user in list(self.users.values()):
+                user_dict = asdict(user)
+                user_dict['created_at'] = user.created_at.isoformat()
+                if user.last_login:
+                    user_dict['last_login'] = user.last_login.isoformat()
+                data.append(user_dict)
+            
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps(data))
+            os.replace(tmp_file, users_file)
+            self._dirty = False  # a full save covers any deferred change
+    
+    def _mark_dirty(self):
+        """Schedule a save, coalescing changes made within SAVE_DELAY."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self):
+        """Write pending changes now, if there are any."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._save()
     
     def _hash_password(self, password: str, salt: bytes = None) -> tuple:
-        """Hash password with PBKDF2."""
+        """
+        Hash a password, returning (hash, salt).
+        
+        New hashes use Argon2id when argon2-cffi is installed; the PHC
+        string carries its own salt and parameters, so the salt is "".
+        Passing a salt (or lacking argon2) gives a PBKDF2 hash as before.
+        """
+        if salt is None and ARGON2_AVAILABLE:
+            return (self._argon2.hash(password), "")
+        
         if salt is None:
             salt = secrets.token_bytes(32)
         
-        hash_bytes = hashlib.pbkdf2_hmac(
+        return (
+            self._pbkdf2(password, salt).hex(),
+            salt.hex(),
+        )
+    
+    @staticmethod
+    def _pbkdf2(password: str, salt: bytes) -> bytes:
+        """Raw PBKDF2-SHA256 digest; hex is only used for storage."""
+        return hashlib.pbkdf2_hmac(
             'sha256',
             password.encode(),
             salt,
             480000,
         )
-        
-        return (
-            hash_bytes.hex(),
-            salt.hex(),
-        )
     
     def _verify_hash(self, password: str, stored_hash: str, stored_salt: str) -> bool:
-        """Verify password against hash."""
-        salt = bytes.fromhex(stored_salt)
-        computed_hash, _ = self._hash_password(password, salt)
-        return secrets.compare_digest(computed_hash, stored_hash)
+        """Verify password against an Argon2 or PBKDF2 hash."""
+        if stored_hash.startswith("$argon2"):
+            # Not a wrong password: the user can't log in until it's installed
+            if not ARGON2_AVAILABLE:
+                raise RuntimeError("argon2-cffi not installed, cannot verify Argon2 hash")
+            try:
+                return self._argon2.verify(stored_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        
+        try:
+            salt = bytes.fromhex(stored_salt)
+            expected = bytes.fromhex(stored_hash)
+        except ValueError:
+            return False
+        return hmac.compare_digest(self._pbkdf2(password, salt), expected)
+    
+    def _needs_rehash(self, stored_hash: str) -> bool:
+        """Check if a verified hash should be upgraded to current settings."""
+        if not ARGON2_AVAILABLE:
+            return False
+        if not stored_hash.startswith("$argon2"):
+            return True  # legacy PBKDF2
+        try:
+            return self._argon2.check_needs_rehash(stored_hash)
+        except InvalidHashError:
+            return True
+    
+    def _purge_expired(self):
+        """Drop sessions whose expiry has passed, oldest first."""
+        now = datetime.now()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, session_id = heapq.heappop(heap)
+            self.sessions.pop(session_id, None)  # may already be logged out
+            if self.current_session and self.current_session.session_id == session_id:
+                self.current_session = None
     
     def register(self, username: str, password: str) -> UserProfile:
         """
@@ -139,9 +251,8 @@ class AuthManager:
             Created UserProfile
         """
         # Check if username exists
-        for user in self.users.values():
-            if user.username.lower() == username.lower():
-                raise ValueError("Username already exists")
+        if username.lower() in self._by_username:
+            raise ValueError("Username already exists")
         
         # Create user
         user_id = secrets.token_urlsafe(16)
@@ -156,8 +267,10 @@ class AuthManager:
             settings={},
         )
         
-        self.users[user_id] = user
-        self._save()
+        with self._save_lock:
+            self.users[user_id] = user
+            self._by_username[username.lower()] = user_id
+            self._save()
         
         return user
     
@@ -172,12 +285,11 @@ class AuthManager:
         Returns:
             UserSession if successful, None otherwise
         """
+        self._purge_expired()
+        
         # Find user
-        user = None
-        for u in self.users.values():
-            if u.username.lower() == username.lower():
-                user = u
-                break
+        user_id = self._by_username.get(username.lower())
+        user = self.users.get(user_id) if user_id else None
         
         if not user:
             return None
@@ -186,6 +298,10 @@ class AuthManager:
         if not self._verify_hash(password, user.password_hash, user.password_salt):
             return None
         
+        # Upgrade PBKDF2 (or outdated Argon2) hashes now that we have the password
+        if self._needs_rehash(user.password_hash):
+            user.password_hash, user.password_salt = self._hash_password(password)
+        
         # Create session
         session = UserSession(
             session_id=secrets.token_urlsafe(32),
@@ -197,10 +313,11 @@ class AuthManager:
         
         self.sessions[session.session_id] = session
         self.current_session = session
+        heapq.heappush(self._expiry_heap, (session.expires_at, session.session_id))
         
-        # Update last login
+        # Update last login; not worth a synchronous write per login
         user.last_login = datetime.now()
-        self._save()
+        self._mark_dirty()
         
         return session
     
@@ -213,11 +330,14 @@ class AuthManager:
             del self.sessions[session_id]
             if self.current_session and self.current_session.session_id == session_id:
                 self.current_session = None
+            self.flush()
             return True
         return False
     
     def validate_session(self, session_id: str = None) -> bool:
         """Check if session is valid."""
+        self._purge_expired()
+        
         if session_id is None and self.current_session:
             session_id = self.current_session.session_id
         
@@ -246,9 +366,10 @@ class AuthManager:
         pin_hash, pin_salt = self._hash_password(pin)
         
         user = self.users[user_id]
-        user.pin_hash = pin_hash
-        user.pin_salt = pin_salt
-        self._save()
+        with self._save_lock:
+            user.pin_hash = pin_hash
+            user.pin_salt = pin_salt
+            self._save()
         
         return True
     
@@ -258,10 +379,17 @@ class AuthManager:
             return False
         
         user = self.users[user_id]
-        if not user.pin_hash or not user.pin_salt:
+        if not user.pin_hash:
             return False
         
-        return self._verify_hash(pin, user.pin_hash, user.pin_salt)
+        if not self._verify_hash(pin, user.pin_hash, user.pin_salt or ""):
+            return False
+        
+        if self._needs_rehash(user.pin_hash):
+            user.pin_hash, user.pin_salt = self._hash_password(pin)
+            self._mark_dirty()
+        
+        return True
     
     def is_locked(self) -> bool:
         """Check if session is locked due to inactivity."""
@@ -290,12 +418,29 @@ class AuthManager:
             return False
         
         # Set new password
-        user.password_hash, user.password_salt = self._hash_password(new_password)
-        self._save()
+        password_hash, password_salt = self._hash_password(new_password)
+        with self._save_lock:
+            user.password_hash, user.password_salt = password_hash, password_salt
+            self._save()
         
         return True
 
 
+# Singleton shared by the auth tools, so a session created by login is
+# still there for who_am_i and logout
+_auth_manager: Optional[AuthManager] = None
+_auth_lock = threading.Lock()
+
+
+def get_auth_manager() -> AuthManager:
+    """Get or create auth manager singleton."""
+    global _auth_manager
+    with _auth_lock:
+        if _auth_manager is None:
+            _auth_manager = AuthManager()
+        return _auth_manager
+
+
 from tools.registry import tool, ToolResult, RiskLevel
 
 
@@ -307,7 +452,7 @@ from tools.registry import tool, ToolResult, RiskLevel
 def login(username: str, password: str) -> ToolResult:
     """Login."""
     try:
-        auth = AuthManager()
+        auth = get_auth_manager()
         session = auth.login(username, password)
         
         if session:
@@ -329,7 +474,7 @@ def login(username: str, password: str) -> ToolResult:
 def logout() -> ToolResult:
     """Logout."""
     try:
-        auth = AuthManager()
+        auth = get_auth_manager()
         auth.logout()
         return ToolResult(success=True, output="Logged out")
     except Exception as e:
@@ -344,7 +489,7 @@ def logout() -> ToolResult:
 def who_am_i() -> ToolResult:
     """Get current user."""
     try:
-        auth = AuthManager()
+        auth = get_auth_manager()
         user = auth.get_current_user()
         
         if user:
@@ -150,3 +150,528 @@ class TestNewAutomationFeatures:
             assert hasattr(player, 'play')
         except ImportError as e:
             pytest.skip(f"MacroPlayer not available: {e}")
+
+
+class TestCalendarTimeParsing:
+    """Test add_event start-time parsing."""
+    
+    def test_parse_known_formats(self):
+        """Test each supported format parses."""
+        try:
+            from integrations.calendar import _parse_start_time
+        except ImportError as e:
+            pytest.skip(f"Calendar not available: {e}")
+        
+        assert _parse_start_time("2024-05-01T10:30").hour == 10
+        assert _parse_start_time("2024-5-1 9:05").minute == 5
+        assert _parse_start_time("2024-05-01").day == 1
+        assert _parse_start_time("9:30").hour == 9
+    
+    def test_parse_unknown_format(self):
+        """Test unknown formats return None and bad values raise."""
+        try:
+            from integrations.calendar import _parse_start_time
+        except ImportError as e:
+            pytest.skip(f"Calendar not available: {e}")
+        
+        assert _parse_start_time("tomorrow") is None
+        with pytest.raises(ValueError):
+            _parse_start_time("2024-13-01")
+
+
+class TestNotificationManager:
+    """Test notification history persistence."""
+    
+    def _manager(self, temp_dir, **kwargs):
+        try:
+            from integrations.notifications import NotificationManager
+        except ImportError as e:
+            pytest.skip(f"NotificationManager not available: {e}")
+        return NotificationManager(
+            storage_path=str(temp_dir / "notifications.jsonl.gz"),
+            **kwargs,
+        )
+    
+    def test_history_survives_reload(self, temp_dir):
+        """Test sends, reads and deletes are replayed on load."""
+        manager = self._manager(temp_dir)
+        first = manager.send("One", "first", desktop=False)
+        second = manager.send("Two", "second", desktop=False)
+        manager.send("Three", "third", desktop=False)
+        manager.mark_read(first.id)
+        manager.delete(second.id)
+        
+        reloaded = self._manager(temp_dir)
+        assert [n.title for n in reloaded.notifications] == ["One", "Three"]
+        assert reloaded.notifications[0].read is True
+        assert reloaded.notifications[1].read is False
+    
+    def test_log_is_compacted(self, temp_dir):
+        """Test the log is rewritten once it exceeds twice the history cap."""
+        manager = self._manager(temp_dir, max_history=5)
+        for i in range(12):
+            manager.send(f"N{i}", "body", category="info", desktop=False)
+        
+        import gzip
+        with gzip.open(temp_dir / "notifications.jsonl.gz", "rt") as f:
+            lines = f.read().splitlines()
+        lines += (temp_dir / "notifications.jsonl").read_text().splitlines()
+        assert len(lines) <= 2 * manager.max_history
+        
+        reloaded = self._manager(temp_dir, max_history=5)
+        assert [n.title for n in reloaded.get_recent(5)] == [f"N{i}" for i in range(7, 12)]
+        assert len(reloaded.get_by_category("info")) == 5
+    
+    def test_torn_log_tail_is_recovered(self, temp_dir):
+        """Test a truncated last append keeps earlier entries and later appends."""
+        manager = self._manager(temp_dir)
+        manager.send("One", "first", desktop=False)
+        manager.send("Two", "second", desktop=False)
+        manager.send("Three", "third", desktop=False)
+
+        journal_path = temp_dir / "notifications.jsonl"
+        data = journal_path.read_bytes()
+        journal_path.write_bytes(data[:-10])  # cut into the last line
+
+        reloaded = self._manager(temp_dir)
+        assert [n.title for n in reloaded.notifications] == ["One", "Two"]
+
+        reloaded.send("Four", "fourth", desktop=False)
+        again = self._manager(temp_dir)
+        assert [n.title for n in again.notifications] == ["One", "Two", "Four"]
+
+    def test_legacy_json_history_is_migrated(self, temp_dir):
+        """Test the old notifications.json next to the log is imported."""
+        import json
+        legacy = {"notifications": [{
+            "id": "notif_1", "title": "Old", "message": "kept",
+            "category": "general", "priority": "normal",
+            "timestamp": "2024-05-01T10:30:00", "read": True, "actions": None,
+        }]}
+        legacy_path = temp_dir / "notifications.json"
+        legacy_path.write_text(json.dumps(legacy, indent=2))
+
+        manager = self._manager(temp_dir)
+        assert [n.title for n in manager.notifications] == ["Old"]
+        assert manager.notifications[0].read is True
+        assert legacy_path.exists()
+
+        manager.send("New", "body", desktop=False)
+        reloaded = self._manager(temp_dir)
+        assert [n.title for n in reloaded.notifications] == ["Old", "New"]
+
+    def test_legacy_file_as_storage_path_is_rewritten(self, temp_dir):
+        """Test a JSON-array history at storage_path is replayed, not wiped."""
+        import json
+        path = temp_dir / "notifications.jsonl.gz"
+        path.write_text(json.dumps([{
+            "id": "notif_1", "title": "Old", "message": "kept",
+            "category": "general", "priority": "normal",
+            "timestamp": "2024-05-01T10:30:00",
+        }]))
+
+        manager = self._manager(temp_dir)
+        assert [n.title for n in manager.notifications] == ["Old"]
+        assert [n.title for n in self._manager(temp_dir).notifications] == ["Old"]
+
+    def test_unreadable_log_is_set_aside(self, temp_dir):
+        """Test a log whose first entry doesn't parse is kept, not compacted over."""
+        path = temp_dir / "notifications.jsonl.gz"
+        path.write_bytes(b"not a notification log\n")
+
+        manager = self._manager(temp_dir)
+        assert len(manager.notifications) == 0
+        manager.clear_all()
+
+        aside = temp_dir / "notifications.jsonl.gz.unreadable"
+        assert aside.read_bytes() == b"not a notification log\n"
+
+    def test_unread_and_category_indices(self, temp_dir):
+        """Test unread and category queries track mutations."""
+        manager = self._manager(temp_dir)
+        info = manager.send("Info", "a", category="info", desktop=False)
+        warn = manager.send("Warn", "b", category="warning", desktop=False)
+        manager.send("Info 2", "c", category="info", desktop=False)
+        
+        assert [n.title for n in manager.get_by_category("info")] == ["Info", "Info 2"]
+        
+        manager.mark_read(info.id)
+        manager.delete(warn.id)
+        assert [n.title for n in manager.get_unread()] == ["Info 2"]
+        assert manager.get_by_category("warning") == []
+        
+        manager.mark_all_read()
+        assert manager.get_unread() == []
+    
+    def test_multi_category_query(self, temp_dir):
+        """Test multi-category queries stay ordered across evictions."""
+        manager = self._manager(temp_dir, max_history=4)
+        for i, category in enumerate(["info", "warning", "error", "info", "error", "warning"]):
+            manager.send(f"N{i}", "body", category=category, desktop=False)
+        
+        picked = manager.get_by_categories(["warning", "error"])
+        assert [n.title for n in picked] == ["N2", "N4", "N5"]
+        
+        manager.delete(picked[1].id)
+        assert [n.title for n in manager.get_by_categories(["info", "warning"])] == ["N3", "N5"]
+
+
+class TestSmartHomeHub:
+    """Test smart home hub device management."""
+    
+    def _hub(self, temp_dir):
+        try:
+            from integrations.smart_home import SmartHomeHub
+        except ImportError as e:
+            pytest.skip(f"SmartHomeHub not available: {e}")
+        return SmartHomeHub(config_path=str(temp_dir / "smart_home.json"))
+    
+    def test_find_device(self, temp_dir):
+        """Test exact names win over substring matches."""
+        hub = self._hub(temp_dir)
+        hub.add_device("Kitchen Light", "light")
+        lamp = hub.add_device("Light", "light")
+        
+        assert hub.find_device("LIGHT").name == "Light"
+        assert hub.find_device("kitchen").name == "Kitchen Light"
+        assert hub.find_device("garage") is None
+        
+        hub.remove_device(lamp.id)
+        assert hub.find_device("light").name == "Kitchen Light"
+
+    def test_device_ids_unique_after_removal(self, temp_dir):
+        """Test adding after a removal does not overwrite a device."""
+        hub = self._hub(temp_dir)
+        first = hub.add_device("Fan", "switch")
+        second = hub.add_device("Heater", "switch")
+        hub.remove_device(first.id)
+        third = hub.add_device("Lamp", "light")
+
+        assert third.id != second.id
+        assert len(hub.devices) == 2
+
+    def test_room_control_persists(self, temp_dir):
+        """Test room changes are saved once and survive reload."""
+        hub = self._hub(temp_dir)
+        first = hub.add_device("Lamp", "light", room="den")
+        second = hub.add_device("Fan", "switch", room="den")
+        
+        with patch.object(hub, "_save", wraps=hub._save) as save:
+            hub.room_on("den")
+        assert save.call_count == 1
+        
+        reloaded = self._hub(temp_dir)
+        assert reloaded.devices[first.id].state["on"] is True
+        assert reloaded.devices[second.id].state["on"] is True
+
+    def test_corrupt_config_is_handled_once(self, temp_dir):
+        """Test a corrupt config keeps the devices and isn't re-parsed each call."""
+        hub = self._hub(temp_dir)
+        lamp = hub.add_device("Lamp", "light")
+
+        (temp_dir / "smart_home.json").write_text("{not json")
+        with patch.object(hub, "_load", wraps=hub._load) as load:
+            assert hub.reload_if_changed() is False
+            assert hub.reload_if_changed() is False
+        assert load.call_count == 1
+        assert hub.find_device("lamp").id == lamp.id
+
+    def test_home_assistant_rejections_are_reported(self, temp_dir):
+        """Test devices Home Assistant rejects keep their state and are reported."""
+        try:
+            import httpx
+            from integrations import smart_home
+        except ImportError as e:
+            pytest.skip(f"Smart home push not available: {e}")
+
+        def handler(request):
+            status = 401 if b"light.den" in request.content else 200
+            return httpx.Response(status, json=[])
+
+        transport = httpx.MockTransport(handler)
+        real_client = httpx.AsyncClient
+        hub = smart_home.SmartHomeHub(
+            config_path=str(temp_dir / "smart_home.json"),
+            home_assistant_url="http://ha.local",
+            home_assistant_token="token",
+        )
+        for entity_id in ("light.den", "light.hall"):
+            hub.devices[entity_id] = smart_home.SmartDevice(
+                id=entity_id, name=entity_id, type="light",
+                state={"on": False}, room="home", platform="home_assistant",
+            )
+        hub.rooms["home"] = ["light.den", "light.hall"]
+
+        with patch.object(smart_home.httpx, "AsyncClient",
+                          lambda **kw: real_client(transport=transport, **kw)):
+            with pytest.raises(RuntimeError):
+                hub.turn_on("light.den")
+            assert hub.devices["light.den"].state["on"] is False
+
+            assert hub.turn_on("light.hall").state["on"] is True
+
+            controlled = hub.room_off("home")
+        assert [d.id for d in controlled] == ["light.hall"]
+        assert hub.devices["light.hall"].state["on"] is False
+
+    def test_listener_retries_after_auth_failure_and_drop(self, temp_dir):
+        """Test the websocket listener reconnects and applies events."""
+        import asyncio
+        try:
+            from aiohttp import web
+            from aiohttp.test_utils import TestServer
+            from integrations import smart_home
+        except ImportError as e:
+            pytest.skip(f"Smart home listener not available: {e}")
+
+        connections = []
+
+        async def websocket(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            connections.append(ws)
+            await ws.send_json({"type": "auth_required"})
+            await ws.receive_json()
+            if len(connections) == 1:
+                await ws.send_json({"type": "auth_invalid", "message": "bad token"})
+            else:
+                await ws.send_json({"type": "auth_ok"})
+                await ws.receive_json()  # subscribe_events
+                await ws.send_json({"type": "event", "event": {"data": {
+                    "entity_id": "light.den", "new_state": {"state": "on"},
+                }}})
+            await ws.close()
+            return ws
+
+        app = web.Application()
+        app.router.add_get("/api/websocket", websocket)
+
+        async def scenario(hub):
+            async with TestServer(app) as server:
+                hub.ha_url = f"http://{server.host}:{server.port}"
+                listener = asyncio.ensure_future(hub._ha_listen())
+                try:
+                    for _ in range(200):
+                        if hub.devices["light.den"].state["on"] and len(connections) >= 3:
+                            break
+                        await asyncio.sleep(0.01)
+                finally:
+                    listener.cancel()
+
+        hub = smart_home.SmartHomeHub(
+            config_path=str(temp_dir / "smart_home.json"),
+            home_assistant_token="token",
+        )
+        hub.HA_RETRY_DELAY = 0.01
+        hub.devices["light.den"] = smart_home.SmartDevice(
+            id="light.den", name="Den", type="light",
+            state={"on": False}, platform="home_assistant",
+        )
+        asyncio.run(scenario(hub))
+
+        # Rejected once, then applied the event, then reconnected after the drop
+        assert hub.devices["light.den"].state["on"] is True
+        assert len(connections) >= 3
+
+
+class TestSlackHistory:
+    """Test conversations.history parsing."""
+    
+    @pytest.mark.parametrize("streaming", [True, False])
+    def test_history_parsing(self, streaming):
+        """Test streamed and buffered bodies give the same messages."""
+        try:
+            import httpx
+            from integrations import slack
+        except ImportError as e:
+            pytest.skip(f"Slack client not available: {e}")
+        if streaming and not slack.IJSON_AVAILABLE:
+            pytest.skip("ijson not installed")
+        
+        body = (
+            b'{"ok": true, "messages": ['
+            b'{"ts": "1.0", "user": "U1", "text": "hi", "blocks": [{"elements": []}]},'
+            b'{"ts": "2.0", "text": "yo"}], "has_more": false}'
+        )
+        
+        def handler(request):
+            if request.url.params["channel"] == "C1":
+                return httpx.Response(200, content=body)
+            return httpx.Response(200, content=b'{"ok": false, "error": "channel_not_found"}')
+        
+        client = slack.SlackClient(token="xoxb-test")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=client.BASE_URL)
+        
+        with patch.object(slack, "IJSON_AVAILABLE", streaming):
+            messages = slack.run_sync(client._history("C1", 10))
+            missing = slack.run_sync(client._history("general", 10))
+        
+        assert [(m.ts, m.user, m.text) for m in messages] == [("1.0", "U1", "hi"), ("2.0", "unknown", "yo")]
+        assert missing is None
+
+    def test_overlapping_reads_resolve_their_own_channel(self):
+        """Test concurrent read_channel calls don't share a channel lookup."""
+        import asyncio
+        from types import SimpleNamespace
+        try:
+            from integrations import slack
+        except ImportError as e:
+            pytest.skip(f"Slack client not available: {e}")
+
+        client = slack.SlackClient(token="xoxb-test")
+
+        async def find_channel(name):
+            await asyncio.sleep(0.02 if name == "alpha" else 0)
+            return SimpleNamespace(id=f"{name}-id")
+
+        async def history(channel, limit):
+            await asyncio.sleep(0)
+            return [channel] if channel.endswith("-id") else None
+
+        async def both():
+            return await asyncio.gather(
+                client.read_channel("alpha"),
+                client.read_channel("beta"),
+            )
+
+        with patch.object(client, "find_channel", find_channel), \
+                patch.object(client, "_history", history):
+            assert slack.run_sync(both()) == [["alpha-id"], ["beta-id"]]
+
+
+class TestWebhookManager:
+    """Test webhook event handling."""
+    
+    def _manager(self, temp_dir):
+        try:
+            from integrations.webhooks import WebhookManager
+        except ImportError as e:
+            pytest.skip(f"WebhookManager not available: {e}")
+        return WebhookManager(storage_path=str(temp_dir / "webhooks"))
+    
+    def test_signature_checked_against_raw_body(self, temp_dir):
+        """Test the HMAC is computed over the bytes that were sent."""
+        import hashlib
+        import hmac
+        
+        manager = self._manager(temp_dir)
+        manager.register_endpoint("github", "/github", secret="s3cret")
+        body = b'{"type":"push",  "ref": "main"}'
+        digest = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        
+        event = manager.handle_event("/github", body, {"X-Hub-Signature-256": f"sha256={digest}"})
+        assert event.signature_valid is True
+        assert event.event_type == "push"
+        
+        event = manager.handle_event("/github", body, {"X-Hub-Signature-256": "sha256=bad"})
+        assert event.signature_valid is False
+    
+    def test_non_json_body(self, temp_dir):
+        """Test non-JSON bodies are kept as raw text."""
+        manager = self._manager(temp_dir)
+        event = manager.handle_event("/other", b"plain text", {})
+        assert event.payload == {"raw": "plain text"}
+        assert event.source == "unknown"
+        
+        form = {"Content-Type": "application/x-www-form-urlencoded"}
+        event = manager.handle_event("/other", b"a=1&b=2", form)
+        assert event.payload == {"raw": "a=1&b=2"}
+        event = manager.handle_event("/other", b'{"a": 1}', form)
+        assert event.payload == {"a": 1}
+        
+        event = manager.handle_event("/other", b"[1, 2]", {})
+        assert event.payload == {"data": [1, 2]}
+
+
+class TestWakeyBatching:
+    """Test batched task creation against a local fake Wakey server."""
+
+    def _run(self, bulk_reply, titles, rounds=1):
+        """Create tasks concurrently; returns (results per round, requests seen)."""
+        import asyncio
+        try:
+            from aiohttp import web
+            from aiohttp.test_utils import TestServer
+            from integrations.wakey import WakeyClient
+        except ImportError as e:
+            pytest.skip(f"Wakey client not available: {e}")
+
+        requests = []
+
+        async def ping(request):
+            return web.json_response({"ok": True})
+
+        async def create(request):
+            payload = await request.json()
+            requests.append(("one", payload["title"]))
+            return web.json_response({"id": f"one-{payload['title']}", **payload}, status=201)
+
+        async def bulk(request):
+            items = (await request.json())["items"]
+            requests.append(("bulk", [p["title"] for p in items]))
+            return bulk_reply(items)
+
+        app = web.Application()
+        app.router.add_get("/api/ping", ping)
+        app.router.add_post("/api/tasks", create)
+        if bulk_reply is not None:
+            app.router.add_post("/api/tasks/bulk", bulk)
+
+        async def scenario():
+            async with TestServer(app) as server:
+                client = WakeyClient(port=server.port)
+                results = []
+                for _ in range(rounds):
+                    results.append(await asyncio.gather(
+                        *(client.create_task(title) for title in titles)
+                    ))
+                await client.disconnect()
+                return results
+
+        return asyncio.run(scenario()), requests
+
+    def test_creates_are_batched_and_split(self):
+        """Test concurrent creates share one bulk request, results in order."""
+        from aiohttp import web
+        reply = lambda items: web.json_response(
+            {"items": [{"id": f"bulk-{p['title']}", **p} for p in items]}
+        )
+        (results,), requests = self._run(reply, ["a", "b", "c"])
+
+        # Each caller gets the item at its own position in the batch
+        assert len(requests) == 1 and sorted(requests[0][1]) == ["a", "b", "c"]
+        assert [(t.id, t.title) for t in results] == [
+            ("bulk-a", "a"), ("bulk-b", "b"), ("bulk-c", "c"),
+        ]
+
+    def test_missing_bulk_endpoint_falls_back(self):
+        """Test a 404 sends creates individually, now and afterwards."""
+        results, requests = self._run(None, ["a", "b"], rounds=2)
+
+        assert [[t.id for t in batch] for batch in results] == [["one-a", "one-b"]] * 2
+        assert all(kind == "one" for kind, _ in requests)
+        assert len(requests) == 4
+
+    @pytest.mark.parametrize("status,body", [
+        (500, {"error": "boom"}),
+        (422, {"detail": "bad id"}),
+        (200, {"ok": True}),
+        (200, {"items": [{"id": "only-one"}]}),
+    ])
+    def test_unusable_bulk_reply_falls_back(self, status, body):
+        """Test errors and short bulk replies fall back to individual creates."""
+        from aiohttp import web
+        reply = lambda items: web.json_response(body, status=status)
+        (results,), requests = self._run(reply, ["a", "b"])
+
+        assert [t.id for t in results] == ["one-a", "one-b"]
+        assert requests[0][0] == "bulk"
+        assert sorted(requests[1:]) == [("one", "a"), ("one", "b")]
+
+    def test_non_json_bulk_reply_falls_back(self):
+        """Test a non-JSON bulk body doesn't raise into the callers."""
+        from aiohttp import web
+        reply = lambda items: web.Response(text="<html>ok</html>", content_type="text/html")
+        (results,), _ = self._run(reply, ["a", "b"])
+
+        assert [t.id for t in results] == ["one-a", "one-b"]
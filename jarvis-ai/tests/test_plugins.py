@@ -0,0 +1,152 @@
+"""
+JARVIS Plugin Tests
+===================
+
+Tests for plugin loading and tool registration.
+"""
+
+import json
+import pytest
+
+
+PLUGIN_SOURCE = '''
+from plugins.loader import Plugin
+
+
+class EchoPlugin(Plugin):
+    def get_name(self):
+        return "echo"
+
+    def get_description(self):
+        return "Echoes text"
+
+    def get_tools(self):
+        return [{
+            "name": "{tool}",
+            "description": "Echo the text",
+            "handler": lambda text="": "{tool}: " + text,
+            "parameters": {"text": "string"},
+        }]
+'''
+
+DECORATED_SOURCE = '''
+from plugins.loader import Plugin, register_plugin
+
+
+class BasePlugin(Plugin):
+    def get_name(self):
+        return "picked"
+
+    def get_description(self):
+        return ""
+
+    def get_tools(self):
+        return [{"name": "base", "description": "", "handler": print}]
+
+
+@register_plugin
+class ChosenPlugin(BasePlugin):
+    def get_tools(self):
+        return [{"name": "chosen", "description": "", "handler": print}]
+'''
+
+IMPL_SOURCE = '''
+from plugins.loader import Plugin
+
+
+class ImportedPlugin(Plugin):
+    def get_name(self):
+        return "imported"
+
+    def get_description(self):
+        return ""
+
+    def get_tools(self):
+        return [{"name": "imported", "description": "", "handler": print}]
+'''
+
+
+def _write_plugin(plugins_dir, name, source, **files):
+    """Create a plugin directory with plugin.json and main.py."""
+    plugin_dir = plugins_dir / name
+    plugin_dir.mkdir(parents=True, exist_ok=True)
+    (plugin_dir / "plugin.json").write_text(json.dumps({"name": name, "version": "1.0.0"}))
+    (plugin_dir / "main.py").write_text(source)
+    for filename, content in files.items():
+        (plugin_dir / filename).write_text(content)
+
+
+class TestPluginManager:
+    """Test plugin tools follow load, reload and unload."""
+
+    @pytest.fixture
+    def manager(self, temp_dir):
+        try:
+            from plugins.manager import PluginManager
+        except ImportError as e:
+            pytest.skip(f"PluginManager not available: {e}")
+        manager = PluginManager(
+            plugins_dir=str(temp_dir / "plugins"),
+            config_path=str(temp_dir / "plugins.json"),
+        )
+        yield manager
+        for name in list(manager._registered):
+            manager._unregister_plugin(name)
+
+    def _tool_names(self, plugin_name):
+        from tools.registry import get_registry
+        return {t.name for t in get_registry().list_tools(category=f"plugin:{plugin_name}")}
+
+    def test_load_reload_unload(self, manager):
+        """Test the registry's tools track each lifecycle step."""
+        _write_plugin(manager.plugins_dir, "echo", PLUGIN_SOURCE.replace("{tool}", "hello"))
+
+        manager.initialize()
+        assert self._tool_names("echo") == {"plugin_echo_hello"}
+
+        from tools.registry import get_registry
+        tool = get_registry().get("plugin_echo_hello")
+        assert tool.handler(text="hi") == "hello: hi"
+
+        # A reload re-executes main.py and must pick up the new class
+        _write_plugin(manager.plugins_dir, "echo", PLUGIN_SOURCE.replace("{tool}", "goodbye"))
+        assert manager.reload_plugin("echo") is True
+        assert self._tool_names("echo") == {"plugin_echo_goodbye"}
+
+        manager.disable_plugin("echo")
+        assert self._tool_names("echo") == set()
+        assert "echo" not in manager.loader.plugin_instances
+
+    def test_plugins_registered_separately(self, manager):
+        """Test initialize registers only plugins not yet registered."""
+        _write_plugin(manager.plugins_dir, "first", PLUGIN_SOURCE.replace("{tool}", "one"))
+        manager.initialize()
+
+        _write_plugin(manager.plugins_dir, "second", PLUGIN_SOURCE.replace("{tool}", "two"))
+        manager.initialize()
+
+        assert self._tool_names("first") == {"plugin_first_one"}
+        assert self._tool_names("second") == {"plugin_second_two"}
+
+        manager.uninstall_plugin("first")
+        assert self._tool_names("first") == set()
+        assert self._tool_names("second") == {"plugin_second_two"}
+
+    def test_register_plugin_picks_class(self, manager):
+        """Test @register_plugin overrides the first class defined."""
+        _write_plugin(manager.plugins_dir, "picked", DECORATED_SOURCE)
+        manager.initialize()
+
+        assert self._tool_names("picked") == {"plugin_picked_chosen"}
+
+    def test_imported_class_found_by_scan(self, manager):
+        """Test a Plugin subclass imported from a helper module is found."""
+        _write_plugin(
+            manager.plugins_dir, "imported",
+            "from imported_plugin_impl import ImportedPlugin\n",
+            **{"imported_plugin_impl.py": IMPL_SOURCE},
+        )
+        manager.initialize()
+
+        assert manager.get_plugin("imported").status == "loaded"
+        assert self._tool_names("imported") == {"plugin_imported_imported"}
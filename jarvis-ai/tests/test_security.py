@@ -0,0 +1,139 @@
+"""
+JARVIS Security Tests
+=====================
+
+Tests for authentication and session handling.
+"""
+
+import os
+import pytest
+from datetime import timedelta
+
+
+@pytest.fixture
+def auth_module():
+    """The security.auth module."""
+    try:
+        from security import auth
+        return auth
+    except ImportError as e:
+        pytest.skip(f"security.auth not available: {e}")
+
+
+@pytest.fixture
+def auth_manager(auth_module, temp_dir):
+    """An AuthManager storing its users in a temporary directory."""
+    manager = auth_module.AuthManager(storage_path=str(temp_dir / "auth"))
+    yield manager
+    manager.flush()
+
+
+class TestAuthManager:
+    """Test password, PIN and session handling."""
+
+    def test_login_and_wrong_password(self, auth_manager):
+        """Test the right password logs in and a wrong one does not."""
+        auth_manager.register("alice", "correct horse")
+
+        assert auth_manager.login("alice", "wrong horse") is None
+        assert auth_manager.current_session is None
+
+        session = auth_manager.login("ALICE", "correct horse")
+        assert session is not None
+        assert auth_manager.get_current_user().username == "alice"
+
+    def test_pbkdf2_user_is_rehashed_to_argon2(self, auth_module, auth_manager):
+        """Test a legacy PBKDF2 hash is upgraded on successful login."""
+        if not auth_module.ARGON2_AVAILABLE:
+            pytest.skip("argon2-cffi not installed")
+
+        user = auth_manager.register("bob", "hunter2")
+        user.password_hash, user.password_salt = auth_manager._hash_password(
+            "hunter2", salt=os.urandom(32)
+        )
+        assert not user.password_hash.startswith("$argon2")
+
+        assert auth_manager.login("bob", "hunter2") is not None
+        assert user.password_hash.startswith("$argon2id")
+        assert user.password_salt == ""
+
+        # The upgraded hash still verifies
+        assert auth_manager.login("bob", "hunter2") is not None
+        assert auth_manager.login("bob", "hunter3") is None
+
+    def test_argon2_hash_without_library_raises(self, auth_module, auth_manager, monkeypatch):
+        """Test an Argon2 hash isn't reported as a wrong password when argon2 is missing."""
+        if not auth_module.ARGON2_AVAILABLE:
+            pytest.skip("argon2-cffi not installed")
+
+        auth_manager.register("hank", "password")
+        monkeypatch.setattr(auth_module, "ARGON2_AVAILABLE", False)
+
+        with pytest.raises(RuntimeError, match="argon2-cffi"):
+            auth_manager.login("hank", "password")
+
+    def test_malformed_hash_fails_instead_of_raising(self, auth_manager):
+        """Test a corrupt stored hash rejects the login."""
+        user = auth_manager.register("carol", "secret")
+        user.password_hash = "not-hex"
+        user.password_salt = "zz"
+
+        assert auth_manager.login("carol", "secret") is None
+
+    def test_pin_round_trip(self, auth_module, auth_manager, temp_dir):
+        """Test a PIN verifies after set_pin and after a reload."""
+        user = auth_manager.register("dave", "password")
+        auth_manager.set_pin(user.user_id, "4321")
+
+        assert auth_manager.verify_pin(user.user_id, "4321") is True
+        assert auth_manager.verify_pin(user.user_id, "1234") is False
+
+        reloaded = auth_module.AuthManager(storage_path=str(temp_dir / "auth"))
+        assert reloaded.verify_pin(user.user_id, "4321") is True
+
+        with pytest.raises(ValueError):
+            auth_manager.set_pin(user.user_id, "12")
+
+    def test_expired_sessions_are_purged(self, auth_manager):
+        """Test sessions past their expiry are dropped on the next check."""
+        auth_manager.register("erin", "password")
+        auth_manager.SESSION_DURATION = timedelta(seconds=-1)
+        session = auth_manager.login("erin", "password")
+
+        assert auth_manager.validate_session(session.session_id) is False
+        assert session.session_id not in auth_manager.sessions
+        assert auth_manager.current_session is None
+        assert auth_manager._expiry_heap == []
+
+    def test_last_login_save_is_deferred_until_flush(self, auth_module, auth_manager, temp_dir):
+        """Test login defers its write and flush persists it."""
+        auth_manager.SAVE_DELAY = 60
+        auth_manager.register("frank", "password")
+        auth_manager.login("frank", "password")
+
+        storage = str(temp_dir / "auth")
+        before = auth_module.AuthManager(storage_path=storage)
+        assert before.users[auth_manager.current_session.user_id].last_login is None
+
+        auth_manager.flush()
+        assert auth_manager._save_timer is None
+
+        after = auth_module.AuthManager(storage_path=storage)
+        assert after.users[auth_manager.current_session.user_id].last_login is not None
+
+
+class TestAuthTools:
+    """Test the auth tools share one manager."""
+
+    def test_session_survives_across_tool_calls(self, auth_module, temp_dir, monkeypatch):
+        """Test a login made through the tool is seen by who_am_i and logout."""
+        manager = auth_module.AuthManager(storage_path=str(temp_dir / "auth"))
+        monkeypatch.setattr(auth_module, "_auth_manager", manager)
+        manager.register("grace", "password")
+
+        assert auth_module.login("grace", "password").success
+        assert auth_module.get_auth_manager() is manager
+        assert auth_module.who_am_i().output["username"] == "grace"
+
+        assert auth_module.logout().success
+        assert auth_module.who_am_i().output == "Not logged in"
@@ -44,6 +44,18 @@ class TestToolRegistry:
         if hasattr(tool_registry, 'list_tools'):
             tools = tool_registry.list_tools()
             assert isinstance(tools, (list, dict))
+    
+    def test_unregister_category(self):
+        """Test removing a category leaves other tools registered."""
+        from tools.registry import ToolRegistry, Tool
+        registry = ToolRegistry()
+        registry.register(Tool(name="a", description="", handler=print, category="plugin:x"))
+        registry.register(Tool(name="b", description="", handler=print, category="plugin:x"))
+        registry.register(Tool(name="c", description="", handler=print, category="plugin:y"))
+        
+        assert registry.unregister_category("plugin:x") == 2
+        assert list(registry.tools) == ["c"]
+        assert registry.unregister_category("plugin:x") == 0
 
 
 class TestNewFeatures:
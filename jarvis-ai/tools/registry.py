@@ -60,6 +60,13 @@ class ToolRegistry:
         """Register a tool."""
         self.tools[tool.name] = tool
     
+    def unregister_category(self, category: str) -> int:
+        """Remove every tool in a category; returns how many were removed."""
+        names = [name for name, t in self.tools.items() if t.category == category]
+        for name in names:
+            del self.tools[name]
+        return len(names)
+    
     def get(self, name: str) -> Optional[Tool]:
         """Get tool by name."""
         return self.tools.get(name)
@@ -163,6 +170,7 @@ def tool(
     description: str = "",
     risk_level: RiskLevel = RiskLevel.LOW,
     reversible: bool = True,
+    requires_confirmation: bool = False,
     category: str = "general",
     examples: Optional[List[str]] = None,
 ):
@@ -186,6 +194,7 @@ def tool(
             handler=wrapper,
             risk_level=risk_level,
             reversible=reversible,
+            requires_confirmation=requires_confirmation,
             category=category,
             examples=examples or [],
         )